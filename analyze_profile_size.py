@@ -1,66 +1,110 @@
 """
 Analyze what takes up space in browser profiles
 """
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List, Optional, Tuple, Union
 from src.core.profile_manager import ProfileManager
+from src.utils.dir_size import dir_size
 
+# Directory walks are stat()-bound, so oversubscribe the CPU count
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Profiles measured at once by main(); each measurement has its own pool
+PROFILE_WORKERS = 4
 
-def get_dir_size(path: Path) -> int:
+# Top-level Chrome directories that hold nearly all of a profile's data
+LARGE_CHROME_DIRS = {'Default', 'System Profile', 'GrShaderCache', 'GraphiteDawnCache'}
+
+
+def _is_large_chrome_dir(name: str) -> bool:
+    """Check if a top-level directory is one of Chrome's bulky data dirs"""
+    return name in LARGE_CHROME_DIRS or name.startswith('Profile ')
+
+
+# Errors expected while walking a live browser profile: entries vanish
+# mid-walk and Chrome keeps some directories locked
+_SKIPPABLE_ERRORS = (FileNotFoundError, PermissionError)
+
+
+def get_dir_size(path: Union[str, Path]) -> int:
     """Calculate directory size"""
-    total = 0
-    try:
-        for f in path.rglob('*'):
-            if f.is_file():
-                try:
-                    total += f.stat().st_size
-                except Exception:
-                    pass
-    except Exception:
-        pass
-    return total
-
-
-def analyze_profile(profile_dir: Path):
-    """Analyze profile directory breakdown"""
+    return dir_size(path)
+
+
+def analyze_profile(profile_dir: Path, quick: bool = False) -> int:
+    """Analyze profile directory breakdown and return its total size
+
+    With quick=True only Chrome's large data directories are walked; other
+    top-level entries are reported by their own stat() size.
+    """
+    return _print_report(profile_dir, _measure_profile(profile_dir, quick))
+
+
+def _measure_profile(profile_dir: Path, quick: bool = False) -> Optional[Tuple[List[str], List[int]]]:
+    """Sizes of a profile's immediate children as (names, sizes), or None if it is missing"""
     if not profile_dir.exists():
+        return None
+    
+    # Sizes of immediate children, kept as parallel name/size lists
+    names = []
+    sizes = []
+    
+    # Check immediate children: size directories in parallel, files inline
+    with os.scandir(profile_dir) as it:
+        children = list(it)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for entry in children:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_dir and (not quick or _is_large_chrome_dir(entry.name)):
+                    futures[executor.submit(get_dir_size, entry.path)] = entry.name
+                elif is_dir or entry.is_file(follow_symlinks=False):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    names.append(entry.name)
+                    sizes.append(size)
+            except _SKIPPABLE_ERRORS:
+                pass
+        for future in as_completed(futures):
+            names.append(futures[future])
+            sizes.append(future.result())
+    return names, sizes
+
+
+def _print_report(profile_dir: Path, breakdown: Optional[Tuple[List[str], List[int]]]) -> int:
+    """Print a measured profile's breakdown and return its total size"""
+    if breakdown is None:
         print(f"Profile directory not found: {profile_dir}")
-        return
+        return 0
+    names, sizes = breakdown
     
     print(f"\n{'='*70}")
     print(f"Analyzing: {profile_dir.name}")
     print(f"{'='*70}")
     
-    # Get all subdirectories and files
-    items = {}
-    
-    # Check immediate children
-    for item in profile_dir.iterdir():
-        if item.is_dir():
-            size = get_dir_size(item)
-            items[item.name] = size
-        elif item.is_file():
-            try:
-                items[item.name] = item.stat().st_size
-            except Exception:
-                pass
-    
-    # Sort by size
-    sorted_items = sorted(items.items(), key=lambda x: x[1], reverse=True)
+    # Sort indices by size instead of materializing (name, size) tuples
+    order = sorted(range(len(sizes)), key=sizes.__getitem__, reverse=True)
     
-    total_size = sum(items.values())
+    total_size = sum(sizes)
+    scale = 100 / total_size if total_size > 0 else 0
     
     print(f"\nTotal size: {total_size / (1024*1024):.2f} MB\n")
     print(f"{'Item':<40} {'Size (MB)':<15} {'%':<10}")
     print("-" * 70)
     
-    for name, size in sorted_items:
-        if size > 0:  # Only show non-empty items
-            size_mb = size / (1024 * 1024)
-            percent = (size / total_size * 100) if total_size > 0 else 0
-            print(f"{name:<40} {size_mb:>10.2f} MB   {percent:>6.1f}%")
+    for i in order:
+        size = sizes[i]
+        if size <= 0:  # Only show non-empty items; the rest sort last
+            break
+        print(f"{names[i]:<40} {size / (1024 * 1024):>10.2f} MB   {size * scale:>6.1f}%")
+
+    return total_size
 
 
 def main():
+    quick = '--quick' in sys.argv[1:]
     pm = ProfileManager()
     profiles = pm.list_profiles()
     
@@ -68,16 +112,21 @@ def main():
         print("No profiles found!")
         return
     
+    # Measure profiles in parallel; map() yields results in submission
+    # order, so each report is printed in profile order as soon as it is ready
+    names = list(profiles)
+    profile_dirs = [pm.profile_dir(name) for name in names]
+    sizes = {}
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        breakdowns = executor.map(lambda d: _measure_profile(d, quick), profile_dirs)
+        for name, profile_dir, breakdown in zip(names, profile_dirs, breakdowns):
+            sizes[name] = _print_report(profile_dir, breakdown)
+    
+    # Summarize from the sizes computed above instead of walking again
     print("\nAvailable profiles:")
-    for i, name in enumerate(profiles.keys(), 1):
-        total_size = pm.get_profile_size(name)
+    for i, (name, total_size) in enumerate(sizes.items(), 1):
         print(f"{i}. {name} ({total_size / (1024*1024):.2f} MB)")
     
-    # Analyze all profiles
-    for name in profiles.keys():
-        profile_dir = pm.profile_dir(name)
-        analyze_profile(profile_dir)
-    
     print("\n" + "="*70)
     print("Analysis complete!")
     print("="*70)
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.config_manager import config_manager
+from src.core.browser_launcher import BrowserLauncher
 from src.core.profile_manager import ProfileManager
 from src.gui.main_window import ProfileManagerGUI
 
@@ -16,10 +17,17 @@ def main():
     try:
         # Initialize configuration
         config_manager.load_config()
-        
+
+        # Get the driver ready while the user is still picking a profile
+        BrowserLauncher.preload_engine()
+
         profile_manager = ProfileManager()
         app = ProfileManagerGUI(profile_manager)
-        app.mainloop()
+        try:
+            app.mainloop()
+        finally:
+            # Write metadata edits still waiting for their delayed flush
+            profile_manager.flush_pending()
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
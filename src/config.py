@@ -22,15 +22,14 @@ except Exception as e:
 METADATA_FILE = PROFILES_DIR / "profiles.json"
 
 # Browser settings
-DEFAULT_BROWSER_ARGS = [
+DEFAULT_BROWSER_ARGS = (
     '--disable-blink-features=AutomationControlled',
     '--disable-dev-shm-usage',
     '--no-sandbox',
     '--disable-setuid-sandbox',
     '--disable-infobars',
     '--disable-popup-blocking',
-    '--disable-blink-features=AutomationControlled'
-]
+)
 
 # UI Colors
 UI_COLORS = {
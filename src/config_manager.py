@@ -1,11 +1,13 @@
 """
 Centralized configuration management system
 """
-import json
 import logging
+import os
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
+from src.utils import json_codec
+
 logger = logging.getLogger(__name__)
 
 class ConfigManager:
@@ -13,33 +15,44 @@ class ConfigManager:
     
     def __init__(self, config_path: str = "settings.json"):
         self.config_path = Path(config_path)
-        self._config: Dict[str, Any] = {}
+        self._data: Dict[str, Any] = {}
+        self._loaded = False
+        # Typed getter results keyed by (type, key, default)
+        self._typed_cache: Dict[tuple, Any] = {}
         self._defaults: Dict[str, Any] = {
             "autosync_enabled": True,
             "drive_folder_id": "",
             "proxy_test_timeout": 10,
             "browser_engine": "chromedriver"
         }
-        self.load_config()
+    
+    @property
+    def _config(self) -> Dict[str, Any]:
+        """Configuration dict, loaded from disk on first access"""
+        if not self._loaded:
+            self.load_config()
+        return self._data
     
     def load_config(self) -> bool:
         """Load configuration from JSON file"""
+        self._loaded = True
+        self._typed_cache.clear()
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    self._data = json_codec.loads(f.read())
                 logger.info(f"Configuration loaded from {self.config_path}")
                 return True
             else:
                 # Create default config file if it doesn't exist
-                self._config = self._defaults.copy()
+                self._data = self._defaults.copy()
                 self.save_config()
                 logger.info(f"Default configuration created at {self.config_path}")
                 return True
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
             # Fall back to defaults
-            self._config = self._defaults.copy()
+            self._data = self._defaults.copy()
             return False
     
     def save_config(self) -> bool:
@@ -48,8 +61,10 @@ class ConfigManager:
             # Ensure the directory exists
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2, ensure_ascii=False)
+            # Swap in a complete file so readers never see a truncated one
+            tmp_path = self.config_path.with_suffix(".json.tmp")
+            tmp_path.write_bytes(json_codec.dumps(self._config))
+            os.replace(tmp_path, self.config_path)
             logger.info(f"Configuration saved to {self.config_path}")
             return True
         except Exception as e:
@@ -63,33 +78,50 @@ class ConfigManager:
     def set(self, key: str, value: Any) -> None:
         """Set configuration value"""
         self._config[key] = value
+        self._typed_cache.clear()
     
     def get_bool(self, key: str, default: bool = False) -> bool:
         """Get boolean configuration value"""
+        cache_key = (bool, key, default)
+        if cache_key in self._typed_cache:
+            return self._typed_cache[cache_key]
         value = self._config.get(key, default)
         if isinstance(value, bool):
-            return value
+            result = value
         elif isinstance(value, str):
-            return value.lower() in ('true', '1', 'yes', 'on')
+            result = value.lower() in ('true', '1', 'yes', 'on')
         else:
-            return bool(value)
+            result = bool(value)
+        self._typed_cache[cache_key] = result
+        return result
     
     def get_int(self, key: str, default: int = 0) -> int:
         """Get integer configuration value"""
+        cache_key = (int, key, default)
+        if cache_key in self._typed_cache:
+            return self._typed_cache[cache_key]
         value = self._config.get(key, default)
         try:
-            return int(value)
+            result = int(value)
         except (ValueError, TypeError):
-            return default
+            result = default
+        self._typed_cache[cache_key] = result
+        return result
     
     def get_str(self, key: str, default: str = "") -> str:
         """Get string configuration value"""
+        cache_key = (str, key, default)
+        if cache_key in self._typed_cache:
+            return self._typed_cache[cache_key]
         value = self._config.get(key, default)
-        return str(value) if value is not None else default
+        result = str(value) if value is not None else default
+        self._typed_cache[cache_key] = result
+        return result
     
     def update_from_dict(self, config_dict: Dict[str, Any]) -> None:
         """Update configuration from dictionary"""
         self._config.update(config_dict)
+        self._typed_cache.clear()
     
     @property
     def all_settings(self) -> Dict[str, Any]:
@@ -98,4 +130,4 @@ class ConfigManager:
 
 
 # Global configuration manager instance
-config_manager = ConfigManager()
\ No newline at end of file
+config_manager = ConfigManager()
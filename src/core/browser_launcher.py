@@ -1,11 +1,14 @@
 """
 Browser launching with fingerprint injection and proxy support
 """
+import asyncio
+import logging
+import os
 import threading
 import time
 import json
-import psutil
-from typing import Optional, List, Dict
+from types import MappingProxyType
+from typing import Optional, List, Dict, Mapping, Iterable, Set
 from pathlib import Path
 from datetime import datetime
 
@@ -13,10 +16,144 @@ from datetime import datetime
 
 from src.utils.fingerprint_generator import BrowserFingerprint, FingerprintGenerator
 from src.utils.proxy_manager import ProxyConfig
-from src.config import DEFAULT_BROWSER_ARGS
-from src.core.engines.chromedriver_engine import ChromeDriverEngine
+from src.utils import json_codec
+from src.config import DEFAULT_BROWSER_ARGS, PROFILES_DIR
 from src.config_manager import config_manager
 
+logger = logging.getLogger(__name__)
+
+# psutil is imported on first use to keep it off the GUI start-up path
+_psutil_module = None
+
+
+def _psutil():
+    """Return the psutil module, importing it on first call"""
+    global _psutil_module
+    if _psutil_module is None:
+        import psutil
+        _psutil_module = psutil
+    return _psutil_module
+
+
+# Snapshot of (pid, lowercased name, cmdline) for every process on the system,
+# shared by all is_running() fallback checks within one refresh tick
+_PROCESS_SCAN_TTL = 1.0
+_process_scan_cache = {"ts": 0.0, "entries": []}
+
+
+def _scan_processes(force: bool = False) -> list:
+    """Return the cached process snapshot, rebuilding it when stale"""
+    now = time.monotonic()
+    if force or now - _process_scan_cache["ts"] > _PROCESS_SCAN_TTL:
+        psutil = _psutil()
+        entries = []
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            try:
+                entries.append((
+                    proc.info['pid'],
+                    (proc.info['name'] or '').lower(),
+                    proc.info['cmdline'] or []
+                ))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        _process_scan_cache["entries"] = entries
+        _process_scan_cache["ts"] = now
+    return _process_scan_cache["entries"]
+
+
+# Switch that names the profile directory of a browser process
+_USER_DATA_DIR_ARG = '--user-data-dir='
+
+
+def _normalize_dir(path: str) -> str:
+    """Absolute, case-normalized form of a directory path for equality checks"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+# Fingerprint injection script; values are spliced in as JSON literals
+_FINGERPRINT_TEMPLATE = """
+        (() => {{
+            try {{
+                // Override navigator properties
+                if (navigator) {{
+                    Object.defineProperty(navigator, 'userAgent', {{
+                        get: () => {user_agent}
+                    }});
+                    Object.defineProperty(navigator, 'platform', {{
+                        get: () => {platform}
+                    }});
+                    Object.defineProperty(navigator, 'vendor', {{
+                        get: () => {vendor}
+                    }});
+                    Object.defineProperty(navigator, 'language', {{
+                        get: () => {language}
+                    }});
+                    Object.defineProperty(navigator, 'languages', {{
+                        get: () => {languages}
+                    }});
+                    Object.defineProperty(navigator, 'hardwareConcurrency', {{
+                        get: () => {hardware_concurrency}
+                    }});
+                    Object.defineProperty(navigator, 'deviceMemory', {{
+                        get: () => {device_memory}
+                    }});
+                    // Remove webdriver property safely
+                    try {{
+                        Object.defineProperty(navigator, 'webdriver', {{
+                            get: () => undefined
+                        }});
+                    }} catch (e) {{}}
+                }}
+
+                // Override screen properties when available
+                if (typeof screen !== 'undefined') {{
+                    Object.defineProperty(screen, 'width', {{
+                        get: () => {screen_width}
+                    }});
+                    Object.defineProperty(screen, 'height', {{
+                        get: () => {screen_height}
+                    }});
+                    Object.defineProperty(screen, 'availWidth', {{
+                        get: () => {screen_width}
+                    }});
+                    Object.defineProperty(screen, 'availHeight', {{
+                        get: () => {screen_height}
+                    }});
+                    Object.defineProperty(screen, 'colorDepth', {{
+                        get: () => {color_depth}
+                    }});
+                }}
+
+                // Override WebGL only if available
+                if (window && window.WebGLRenderingContext) {{
+                    const getParameter = WebGLRenderingContext.prototype.getParameter;
+                    WebGLRenderingContext.prototype.getParameter = function(param) {{
+                        if (param === 37445) {{
+                            return {webgl_vendor};
+                        }}
+                        if (param === 37446) {{
+                            return {webgl_renderer};
+                        }}
+                        return getParameter.call(this, param);
+                    }};
+                }}
+
+                // Do not override timezone via Date; Playwright handles timezone emulation
+                console.log('🎭 Fingerprint injected successfully');
+            }} catch (err) {{
+                // Avoid breaking internal pages
+                console.debug('Fingerprint injection error:', err);
+            }}
+        }})();
+        """
+
+_FINGERPRINT_FIELDS = (
+    'user_agent', 'platform', 'vendor', 'language', 'languages',
+    'hardware_concurrency', 'device_memory', 'screen_width', 'screen_height',
+    'color_depth', 'webgl_vendor', 'webgl_renderer',
+)
+
+
 class BrowserProcess:
     """Represents a running browser process"""
 
@@ -25,20 +162,37 @@ class BrowserProcess:
         self.pid = pid
         self.headless = headless
         self.started_at = datetime.now()
+        # Formatted once; reported on every instance state query
+        self.started_at_iso = self.started_at.isoformat()
         self._thread = None
+        # Reuse one process handle instead of re-opening it on every poll
+        psutil = _psutil()
+        try:
+            self._proc = psutil.Process(pid)
+            # Prime the CPU counter so later non-blocking reads have a baseline
+            self._proc.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._proc = None
+
+    def _process(self):
+        """Return the cached psutil.Process handle"""
+        if self._proc is None:
+            raise _psutil().NoSuchProcess(self.pid)
+        return self._proc
 
     def is_alive(self) -> bool:
         """Check if process is still running"""
+        psutil = _psutil()
         try:
-            process = psutil.Process(self.pid)
-            return process.is_running()
+            return self._process().is_running()
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return False
 
     def kill(self) -> bool:
         """Kill the browser process"""
+        psutil = _psutil()
         try:
-            process = psutil.Process(self.pid)
+            process = self._process()
             # Kill all child processes
             children = process.children(recursive=True)
             for child in children:
@@ -54,18 +208,18 @@ class BrowserProcess:
 
     def get_memory_usage(self) -> float:
         """Get memory usage in MB"""
+        psutil = _psutil()
         try:
-            process = psutil.Process(self.pid)
-            mem_info = process.memory_info()
+            mem_info = self._process().memory_info()
             return mem_info.rss / (1024 * 1024)  # Convert to MB
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return 0.0
 
     def get_cpu_percent(self) -> float:
-        """Get CPU usage percentage"""
+        """Get CPU usage percentage since the previous call (non-blocking)"""
+        psutil = _psutil()
         try:
-            process = psutil.Process(self.pid)
-            return process.cpu_percent(interval=0.1)
+            return self._process().cpu_percent(interval=None)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return 0.0
 
@@ -80,21 +234,82 @@ class BrowserLauncher:
     """Launches browser with custom fingerprint and proxy"""
 
     # Track running processes
+    # Copy-on-write: writers publish a new dict under _processes_lock, readers
+    # grab the current reference and never see it change underneath them
     _active_processes: Dict[str, BrowserProcess] = {}
+    _processes_lock = threading.Lock()
+    # profile_name -> monotonic time of the last fallback scan that found nothing
+    _not_running_cache: Dict[str, float] = {}
+    _NOT_RUNNING_TTL = 0.5
+
+    @staticmethod
+    def _register_process(profile_name: str, process: BrowserProcess):
+        """Publish a new process map containing the given process"""
+        with BrowserLauncher._processes_lock:
+            processes = dict(BrowserLauncher._active_processes)
+            processes[profile_name] = process
+            BrowserLauncher._active_processes = processes
+
+    @staticmethod
+    def _unregister_processes(*profile_names: str):
+        """Publish a new process map without the given profiles"""
+        with BrowserLauncher._processes_lock:
+            current = BrowserLauncher._active_processes
+            if not any(name in current for name in profile_names):
+                return
+            BrowserLauncher._active_processes = {
+                name: process for name, process in current.items()
+                if name not in profile_names
+            }
 
     @staticmethod
-    def get_active_processes() -> Dict[str, BrowserProcess]:
-        """Get all active browser processes"""
+    def get_active_processes() -> Mapping[str, BrowserProcess]:
+        """Get a read-only view of all active browser processes"""
+        snapshot = BrowserLauncher._active_processes
+
         # Clean up dead processes
-        dead_profiles = []
-        for profile_name, process in BrowserLauncher._active_processes.items():
+        dead_profiles = None
+        for profile_name, process in snapshot.items():
             if not process.is_alive():
+                if dead_profiles is None:
+                    dead_profiles = []
                 dead_profiles.append(profile_name)
 
-        for profile_name in dead_profiles:
-            del BrowserLauncher._active_processes[profile_name]
+        if dead_profiles:
+            BrowserLauncher._unregister_processes(*dead_profiles)
+            snapshot = BrowserLauncher._active_processes
+
+        return MappingProxyType(snapshot)
+
+    @staticmethod
+    def snapshot() -> Mapping[str, BrowserProcess]:
+        """Get a stable view of active browser processes, safe to iterate"""
+        # Published maps are never mutated, so the view itself is stable
+        return BrowserLauncher.get_active_processes()
+
+    @staticmethod
+    def prime_process_scan():
+        """Refresh the shared process snapshot once before checking many profiles"""
+        try:
+            _scan_processes(force=True)
+        except Exception:
+            pass
+
+    @staticmethod
+    def preload_engine(engine: Optional[str] = None) -> threading.Thread:
+        """Import and prepare the browser engine in the background to speed up the first launch"""
+        def _preload():
+            try:
+                engine_local = engine or config_manager.get_str("browser_engine", "chromedriver")
+                if engine_local == 'chromedriver':
+                    from src.core.engines.chromedriver_engine import ChromeDriverEngine
+                    ChromeDriverEngine.warm_up()
+            except Exception:
+                logger.warning("Error preloading browser engine", exc_info=True)
 
-        return BrowserLauncher._active_processes.copy()
+        thread = threading.Thread(target=_preload, daemon=True)
+        thread.start()
+        return thread
 
     @staticmethod
     def is_running(profile_name: str) -> bool:
@@ -103,27 +318,72 @@ class BrowserLauncher:
         if process and process.is_alive():
             return True
         
+        # Skip the fallback scan if it came up empty very recently
+        checked_at = BrowserLauncher._not_running_cache.get(profile_name)
+        if checked_at is not None and time.monotonic() - checked_at < BrowserLauncher._NOT_RUNNING_TTL:
+            return False
+        
         # Fallback detection: scan for top-level browser process by user-data-dir
         try:
-            from src.core.profile_manager import ProfileManager
-            pdir = ProfileManager().profile_dir(profile_name)
-            pdir_str = str(pdir)
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    name = (proc.info['name'] or '').lower()
-                    cmdline_list = proc.info['cmdline'] or []
-                    cmdline = ' '.join(cmdline_list)
-                    if pdir_str in cmdline and (('chrome' in name) or ('msedge' in name)):
-                        # Exclude helper/renderer/gpu processes
-                        if not any(arg.startswith('--type=') for arg in cmdline_list):
-                            return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            pdir_str = BrowserLauncher._profile_dir_str(profile_name)
+            if any(d == pdir_str for d in BrowserLauncher._browser_user_data_dirs()):
+                return True
         except Exception:
             pass
         
+        BrowserLauncher._not_running_cache[profile_name] = time.monotonic()
         return False
 
+    @staticmethod
+    def running_profiles(profile_names: Iterable[str]) -> Set[str]:
+        """Return which of the given profiles are running, from a single process scan"""
+        running = set()
+        untracked = []
+        for profile_name in profile_names:
+            process = BrowserLauncher._active_processes.get(profile_name)
+            if process and process.is_alive():
+                running.add(profile_name)
+            else:
+                untracked.append(profile_name)
+        if not untracked:
+            return running
+        
+        # Fallback detection for untracked profiles, matched against each browser once
+        try:
+            pdirs = {BrowserLauncher._profile_dir_str(name): name for name in untracked}
+            for user_data_dir in BrowserLauncher._browser_user_data_dirs():
+                name = pdirs.get(user_data_dir)
+                if name is not None:
+                    running.add(name)
+        except Exception:
+            pass
+        return running
+
+    @staticmethod
+    def _profile_dir_str(profile_name: str) -> str:
+        """Normalized profile directory for process matching, resolved without a ProfileManager"""
+        # Imported here: profile_manager imports this module
+        from src.core.profile_manager import _profile_path_in
+        return _normalize_dir(_profile_path_in(os.fspath(PROFILES_DIR), profile_name))
+
+    @staticmethod
+    def _browser_user_data_dirs():
+        """Yield the normalized --user-data-dir of each top-level browser process in the snapshot"""
+        for pid, name, cmdline_list in _scan_processes():
+            # Reject by name first; most processes are not browsers at all
+            if 'chrome' not in name and 'msedge' not in name:
+                continue
+            user_data_dir = None
+            for arg in cmdline_list:
+                if arg.startswith('--type='):
+                    # Helper/renderer/gpu process
+                    break
+                if arg.startswith(_USER_DATA_DIR_ARG):
+                    user_data_dir = arg[len(_USER_DATA_DIR_ARG):]
+            else:
+                if user_data_dir:
+                    yield _normalize_dir(user_data_dir)
+
     @staticmethod
     def kill_process(profile_name: str) -> bool:
         """Kill browser process for profile"""
@@ -131,7 +391,9 @@ class BrowserLauncher:
         if process:
             success = process.kill()
             if success:
-                del BrowserLauncher._active_processes[profile_name]
+                BrowserLauncher._unregister_processes(profile_name)
+                # Drop the snapshot so the killed browser is not reported as running
+                _process_scan_cache["ts"] = 0.0
             return success
         return False
 
@@ -143,8 +405,12 @@ class BrowserLauncher:
             "urls": urls,
             "saved_at": datetime.now().isoformat()
         }
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2)
+        # Serialize once and swap the file in atomically so a crash mid-write
+        # never leaves a truncated session behind
+        data = json_codec.dumps(session_data)
+        tmp_file = session_file.with_suffix('.json.tmp')
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, session_file)
 
     @staticmethod
     def _load_session(profile_dir: Path) -> List[str]:
@@ -154,8 +420,8 @@ class BrowserLauncher:
             return []
 
         try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            with open(session_file, 'rb') as f:
+                session_data = json_codec.loads(f.read())
                 return session_data.get("urls", [])
         except Exception:
             return []
@@ -163,81 +429,8 @@ class BrowserLauncher:
     @staticmethod
     def _get_fingerprint_script(fingerprint: BrowserFingerprint) -> str:
         """Generate JavaScript to inject fingerprint"""
-        return f"""
-        (() => {{
-            try {{
-                // Override navigator properties
-                if (navigator) {{
-                    Object.defineProperty(navigator, 'userAgent', {{
-                        get: () => '{fingerprint.user_agent}'
-                    }});
-                    Object.defineProperty(navigator, 'platform', {{
-                        get: () => '{fingerprint.platform}'
-                    }});
-                    Object.defineProperty(navigator, 'vendor', {{
-                        get: () => '{fingerprint.vendor}'
-                    }});
-                    Object.defineProperty(navigator, 'language', {{
-                        get: () => '{fingerprint.language}'
-                    }});
-                    Object.defineProperty(navigator, 'languages', {{
-                        get: () => {fingerprint.languages}
-                    }});
-                    Object.defineProperty(navigator, 'hardwareConcurrency', {{
-                        get: () => {fingerprint.hardware_concurrency}
-                    }});
-                    Object.defineProperty(navigator, 'deviceMemory', {{
-                        get: () => {fingerprint.device_memory}
-                    }});
-                    // Remove webdriver property safely
-                    try {{
-                        Object.defineProperty(navigator, 'webdriver', {{
-                            get: () => undefined
-                        }});
-                    }} catch (e) {{}}
-                }}
-
-                // Override screen properties when available
-                if (typeof screen !== 'undefined') {{
-                    Object.defineProperty(screen, 'width', {{
-                        get: () => {fingerprint.screen_width}
-                    }});
-                    Object.defineProperty(screen, 'height', {{
-                        get: () => {fingerprint.screen_height}
-                    }});
-                    Object.defineProperty(screen, 'availWidth', {{
-                        get: () => {fingerprint.screen_width}
-                    }});
-                    Object.defineProperty(screen, 'availHeight', {{
-                        get: () => {fingerprint.screen_height}
-                    }});
-                    Object.defineProperty(screen, 'colorDepth', {{
-                        get: () => {fingerprint.color_depth}
-                    }});
-                }}
-
-                // Override WebGL only if available
-                if (window && window.WebGLRenderingContext) {{
-                    const getParameter = WebGLRenderingContext.prototype.getParameter;
-                    WebGLRenderingContext.prototype.getParameter = function(param) {{
-                        if (param === 37445) {{
-                            return '{fingerprint.webgl_vendor}';
-                        }}
-                        if (param === 37446) {{
-                            return '{fingerprint.webgl_renderer}';
-                        }}
-                        return getParameter.call(this, param);
-                    }};
-                }}
-
-                // Do not override timezone via Date; Playwright handles timezone emulation
-                console.log('🎭 Fingerprint injected successfully');
-            }} catch (err) {{
-                // Avoid breaking internal pages
-                console.debug('Fingerprint injection error:', err);
-            }}
-        }})();
-        """
+        values = {field: json.dumps(getattr(fingerprint, field)) for field in _FINGERPRINT_FIELDS}
+        return _FINGERPRINT_TEMPLATE.format_map(values)
 
     @staticmethod
     def launch(
@@ -252,7 +445,8 @@ class BrowserLauncher:
     ):
         """Launch browser with fingerprint and proxy (non-blocking)"""
 
-        # Check if already running
+        # Check if already running (always with a fresh fallback scan)
+        BrowserLauncher._not_running_cache.pop(profile_name, None)
         if BrowserLauncher.is_running(profile_name):
             raise RuntimeError(f"Profile '{profile_name}' is already running")
 
@@ -261,14 +455,17 @@ class BrowserLauncher:
                 engine_local = engine or config_manager.get_str("browser_engine", "chromedriver")
 
                 def register(pid: int):
-                    BrowserLauncher._active_processes[profile_name] = BrowserProcess(
+                    BrowserLauncher._not_running_cache.pop(profile_name, None)
+                    BrowserLauncher._register_process(profile_name, BrowserProcess(
                         profile_name=profile_name,
                         pid=pid,
                         headless=headless
-                    )
+                    ))
 
                 if engine_local == 'chromedriver':
-                    ChromeDriverEngine().run(
+                    # Imported here: pulls in selenium/undetected-chromedriver
+                    from src.core.engines.chromedriver_engine import ChromeDriverEngine
+                    session = ChromeDriverEngine().start(
                         profile_dir=profile_dir,
                         profile_name=profile_name,
                         fingerprint=fingerprint,
@@ -284,12 +481,29 @@ class BrowserLauncher:
                     raise RuntimeError(f"Unknown engine: {engine_local}")
             except Exception as e:
                 print(f"Error launching browser: {e}")
-            finally:
-                if profile_name in BrowserLauncher._active_processes:
-                    del BrowserLauncher._active_processes[profile_name]
-
-
+                BrowserLauncher._unregister_processes(profile_name)
+                return
 
+            async def _watch():
+                try:
+                    try:
+                        await session.monitor()
+                    except Exception:
+                        logger.warning(f"Session monitoring failed for profile '{profile_name}'", exc_info=True)
+                    # close() writes the session file and quits the driver; both
+                    # block, so they must not stall the other profiles' monitors
+                    await asyncio.get_running_loop().run_in_executor(None, session.close)
+                except Exception:
+                    logger.warning(f"Error closing browser for profile '{profile_name}'", exc_info=True)
+                finally:
+                    BrowserLauncher._unregister_processes(profile_name)
+
+            # The browser is up; watch it on the shared engine loop so no
+            # thread stays parked on this profile for the browser's lifetime
+            from src.core.engines.engine_base import EngineBase
+            EngineBase.submit(_watch())
+
+        # Short-lived: only covers the blocking driver start and tab restore
         thread = threading.Thread(target=_run, daemon=True)
         thread.start()
         return thread
@@ -322,13 +536,9 @@ class BrowserLauncher:
         if profile.proxy:
             proxy = ProxyConfig.from_dict(profile.proxy)
 
-        # Update last launched time
+        # Update last launched time (written to metadata in a batch)
         try:
-            md = profile_manager._load_metadata()
-            prof = md.get(profile_name)
-            if prof:
-                prof.last_launched = datetime.utcnow().isoformat()
-                profile_manager._save_metadata(md)
+            profile_manager.touch_last_launched(profile_name)
         except Exception:
             pass
 
@@ -0,0 +1,133 @@
+"""
+Minimal asyncio Chrome DevTools Protocol client on the browser-level websocket
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from src.utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+class CDPError(Exception):
+    """Raised when the browser answers a CDP command with an error"""
+    pass
+
+
+class CDPSession:
+    """Sends CDP commands and queues CDP events over one websocket"""
+
+    def __init__(self, http_session, websocket):
+        self._http = http_session
+        self._ws = websocket
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._events: asyncio.Queue = asyncio.Queue()
+        self.closed = False
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def connect(cls, debugger_address: str, timeout: float = 5.0) -> 'CDPSession':
+        """Open a session to the browser listening on debugger_address"""
+        if aiohttp is None:
+            raise RuntimeError('aiohttp not available. Install with: pip install aiohttp')
+        http = aiohttp.ClientSession()
+        try:
+            async with http.get(f"http://{debugger_address}/json/version",
+                                timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                version = json_codec.loads(await resp.read())
+            ws = await asyncio.wait_for(
+                http.ws_connect(version["webSocketDebuggerUrl"], max_msg_size=0),
+                timeout
+            )
+        except BaseException:
+            await http.close()
+            raise
+        return cls(http, ws)
+
+    async def _read_loop(self):
+        """Dispatch command replies to their futures and queue events"""
+        try:
+            async for message in self._ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    break
+                data = json_codec.loads(message.data)
+                msg_id = data.get("id")
+                if msg_id is None:
+                    self._events.put_nowait(data)
+                    continue
+                future = self._pending.pop(msg_id, None)
+                if future is None or future.done():
+                    continue
+                if "error" in data:
+                    future.set_exception(CDPError(data["error"].get("message", "CDP error")))
+                else:
+                    future.set_result(data.get("result", {}))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"CDP connection dropped: {e}")
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("CDP connection closed"))
+            self._pending.clear()
+            # Sentinel so waiters on next_event() wake up
+            self._events.put_nowait(None)
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None,
+                   timeout: float = 10.0, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Send a command and wait for its result
+
+        session_id routes the command to a target attached with flatten=True.
+        """
+        if self.closed:
+            raise ConnectionError("CDP connection closed")
+        self._next_id += 1
+        msg_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        message = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            await self._ws.send_str(json.dumps(message))
+        except Exception as e:
+            self._pending.pop(msg_id, None)
+            raise ConnectionError(f"CDP connection closed: {e}") from e
+        return await asyncio.wait_for(future, timeout)
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the next event; returns None on timeout
+
+        Raises ConnectionError once the connection is gone.
+        """
+        try:
+            event = await asyncio.wait_for(self._events.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            self._events.put_nowait(None)
+            raise ConnectionError("CDP connection closed")
+        return event
+
+    async def close(self):
+        """Close the websocket and stop the reader"""
+        try:
+            await self._ws.close()
+        except Exception:
+            pass
+        await self._http.close()
+        self._reader.cancel()
+        try:
+            await self._reader
+        except (asyncio.CancelledError, Exception):
+            pass
@@ -1,10 +1,16 @@
 """
 ChromeDriver (undetected-chromedriver) engine implementation
 """
+import asyncio
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict
 import psutil
 
 try:
@@ -15,15 +21,425 @@ except ImportError:
 from src.utils.fingerprint_generator import BrowserFingerprint
 from src.utils.proxy_manager import ProxyConfig
 from src.config import DEFAULT_BROWSER_ARGS
-from src.core.engines.engine_base import EngineBase
+from src.core.engines.engine_base import EngineBase, EngineSession
+from src.core.engines.cdp_session import CDPSession
 
 logger = logging.getLogger(__name__)
 
+# Wait this long after the last tab change before saving the session
+SESSION_SAVE_DEBOUNCE = 0.5
+# Liveness check interval while no target events arrive
+SESSION_HEARTBEAT_INTERVAL = 30.0
+# Fallback poll interval bounds; the interval grows with the time since the last tab change
+POLL_INTERVAL_MIN = 0.5
+POLL_INTERVAL_MAX = 30.0
+# Minimum time between two session file writes
+SESSION_WRITE_INTERVAL = 5.0
+# Only page targets matter for the session; let the browser drop the rest
+_PAGE_TARGET_FILTER = [{"type": "page"}]
+# Internal pages that are never restored
+_BLOCKED_EXACT = frozenset({'', None})
+_BLOCKED_PREFIXES = ('chrome://', 'devtools://', 'chrome-extension://', 'edge://', 'about:')
+
+
+class _SessionWriter:
+    """Skips unchanged URL lists and writes at most once per SESSION_WRITE_INTERVAL
+
+    A change that arrives too soon is held back until it is due or flush() is called.
+    offer() and flush_if_due() are used on the engine loop and write in its
+    executor; flush() writes inline.
+    """
+
+    def __init__(self, save_session: Callable[[Path, list], None], profile_dir: Path, profile_name: str):
+        self._save_session = save_session
+        self._profile_dir = profile_dir
+        self._profile_name = profile_name
+        self._last_digest = None
+        self._last_write = float('-inf')
+        self._pending = None
+        # Repeated save failures are logged once until a save succeeds again
+        self._failure_logged = False
+
+    @staticmethod
+    def _digest(urls: list) -> bytes:
+        # blake2b rather than hash() so the value is stable across runs
+        return hashlib.blake2b('\n'.join(urls).encode('utf-8'), digest_size=8).digest()
+
+    @property
+    def due_at(self) -> Optional[float]:
+        """Monotonic time at which the held-back change may be written"""
+        if self._pending is None:
+            return None
+        return self._last_write + SESSION_WRITE_INTERVAL
+
+    async def offer(self, urls: list):
+        digest = self._digest(urls)
+        if digest == self._last_digest:
+            self._pending = None
+            return
+        self._pending = (urls, digest)
+        await self.flush_if_due()
+
+    async def flush_if_due(self):
+        if self._pending is not None and time.monotonic() >= self.due_at:
+            # Disk I/O stays off the loop shared by every profile's monitor
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def flush(self):
+        if self._pending is None:
+            return
+        urls, digest = self._pending
+        self._pending = None
+        try:
+            self._save_session(self._profile_dir, urls)
+        except Exception as e:
+            if not self._failure_logged:
+                self._failure_logged = True
+                logger.warning(f"Failed to save session for profile '{self._profile_name}': {e}")
+            return
+        self._failure_logged = False
+        self._last_digest = digest
+        self._last_write = time.monotonic()
+        logger.debug("Saved %d URLs for profile: %s", len(urls), self._profile_name)
+
 
 class ChromeDriverEngine(EngineBase):
     name = "chromedriver"
 
-    def run(
+    # Patched chromedriver shared by every launch in this process
+    _driver_path_lock = threading.Lock()
+    _patched_driver_path: Optional[str] = None
+
+    @classmethod
+    def warm_up(cls):
+        """Download and patch chromedriver ahead of the first launch"""
+        if uc is not None:
+            cls._get_patched_driver_path()
+
+    @classmethod
+    def _get_patched_driver_path(cls) -> Optional[str]:
+        """Download and patch chromedriver once, then reuse the binary for every launch"""
+        with cls._driver_path_lock:
+            if cls._patched_driver_path and os.path.exists(cls._patched_driver_path):
+                return cls._patched_driver_path
+            try:
+                patcher = uc.Patcher()
+                patcher.auto()
+                source = patcher.executable_path
+                suffix = '.exe' if source.lower().endswith('.exe') else ''
+                target = os.path.join(
+                    tempfile.gettempdir(), f"uc_driver_{patcher.version_main or 'unknown'}{suffix}"
+                )
+                if not patcher.is_binary_patched(target):
+                    # Copy under a unique name and rename so other instances never see a partial file
+                    tmp_target = f"{target}.{os.getpid()}.tmp"
+                    shutil.copy2(source, tmp_target)
+                    os.replace(tmp_target, target)
+                cls._patched_driver_path = target
+            except Exception as e:
+                logger.warning(f"Failed to prepare shared chromedriver binary: {e}")
+                return None
+            return cls._patched_driver_path
+
+    @staticmethod
+    def _is_profile_browser(proc: psutil.Process, user_data_arg: str) -> bool:
+        """Check if proc is the top-level browser process for a --user-data-dir= argument"""
+        # oneshot() lets name() and cmdline() share the per-process reads
+        with proc.oneshot():
+            name = (proc.name() or '').lower()
+            # Cheap name check first; cmdline is the expensive call
+            if 'chrome' not in name and 'msedge' not in name:
+                return False
+            has_profile = False
+            for arg in proc.cmdline() or ():
+                if arg.startswith('--type='):
+                    # Helper/renderer/gpu process
+                    return False
+                if arg == user_data_arg:
+                    has_profile = True
+            return has_profile
+
+    def _find_browser_pid(self, driver, pdir_str: str) -> Optional[int]:
+        """Locate the browser PID when the driver does not expose it"""
+        user_data_arg = f"--user-data-dir={pdir_str}"
+        # The browser is a direct child of either chromedriver or this process
+        # (undetected-chromedriver spawns it itself), so check those first
+        parent_pids = []
+        service_proc = getattr(getattr(driver, 'service', None), 'process', None)
+        if service_proc is not None:
+            parent_pids.append(service_proc.pid)
+        parent_pids.append(os.getpid())
+        for parent_pid in parent_pids:
+            try:
+                children = psutil.Process(parent_pid).children(recursive=False)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            for proc in children:
+                try:
+                    if self._is_profile_browser(proc, user_data_arg):
+                        return proc.pid
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+
+        # Last resort: scan every process on the system
+        for proc in psutil.process_iter():
+            try:
+                if self._is_profile_browser(proc, user_data_arg):
+                    return proc.pid
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return None
+
+    @staticmethod
+    def _debugger_address(driver) -> Optional[str]:
+        """host:port of the browser's DevTools endpoint"""
+        try:
+            return driver.capabilities['goog:chromeOptions']['debuggerAddress']
+        except (AttributeError, KeyError, TypeError):
+            return getattr(getattr(driver, 'options', None), 'debugger_address', None)
+
+    @staticmethod
+    def _apply_target_event(pages: Dict[str, str], event: dict) -> bool:
+        """Update pages ({targetId: url}) from a Target.* event; returns True if it changed"""
+        method = event.get("method")
+        params = event.get("params") or {}
+        if method in ("Target.targetCreated", "Target.targetInfoChanged"):
+            info = params.get("targetInfo") or {}
+            if info.get("type") != "page":
+                return False
+            target_id = info.get("targetId")
+            url = info.get("url") or ""
+            if target_id in pages and pages[target_id] == url:
+                return False
+            pages[target_id] = url
+            return True
+        if method == "Target.targetDestroyed":
+            return pages.pop(params.get("targetId"), None) is not None
+        return False
+
+    @staticmethod
+    def _session_urls(pages: Dict[str, str]) -> list:
+        """URLs worth restoring from the tracked page targets"""
+        return [
+            url for url in pages.values()
+            if url not in _BLOCKED_EXACT and not url.startswith(_BLOCKED_PREFIXES)
+        ]
+
+    @staticmethod
+    async def _navigate_target(cdp: CDPSession, target_id: str, url: str):
+        """Navigate an existing page target"""
+        attached = await cdp.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        session_id = attached["sessionId"]
+        try:
+            await cdp.send("Page.navigate", {"url": url}, session_id=session_id)
+        finally:
+            await cdp.send("Target.detachFromTarget", {"sessionId": session_id})
+
+    async def _restore_tabs(self, debugger_address: str, urls: list, profile_name: str) -> bool:
+        """Load the first URL in the initial tab and open the rest in the background
+
+        Returns False if the DevTools endpoint could not be reached.
+        """
+        try:
+            cdp = await CDPSession.connect(debugger_address)
+        except Exception as e:
+            logger.warning(f"CDP connection failed for profile '{profile_name}': {e}")
+            return False
+        try:
+            try:
+                targets = await cdp.send("Target.getTargets", {"filter": _PAGE_TARGET_FILTER})
+                pages = [t for t in targets.get("targetInfos", []) if t.get("type") == "page"]
+            except Exception:
+                pages = []
+            if pages:
+                first = self._navigate_target(cdp, pages[0]["targetId"], urls[0])
+            else:
+                first = cdp.send("Target.createTarget", {"url": urls[0]})
+            results = await asyncio.gather(
+                first,
+                *(cdp.send("Target.createTarget", {"url": url, "background": True}) for url in urls[1:]),
+                return_exceptions=True
+            )
+        finally:
+            await cdp.close()
+        if isinstance(results[0], Exception):
+            logger.error(f"Failed to open first tab {urls[0]} for profile '{profile_name}': {results[0]}")
+        for url, result in zip(urls[1:], results[1:]):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to restore tab {url} for profile '{profile_name}': {result}")
+        return True
+
+    async def _watch_session(
+        self,
+        debugger_address: str,
+        profile_name: str,
+        writer: _SessionWriter,
+    ) -> bool:
+        """Save the session on CDP target events until the browser closes
+
+        Returns False if the DevTools endpoint could not be reached, so the
+        caller can fall back to polling.
+        """
+        try:
+            cdp = await CDPSession.connect(debugger_address)
+        except Exception as e:
+            logger.warning(f"CDP connection failed for profile '{profile_name}', falling back to polling: {e}")
+            return False
+
+        pages: Dict[str, str] = {}
+        dirty_since = None
+        # Pages as they were before the current run of targetDestroyed events.
+        # A closing window destroys its tabs one event at a time, so the
+        # shrinking set seen during teardown is never what gets saved.
+        before_closing: Optional[Dict[str, str]] = None
+        try:
+            # Existing targets are reported as targetCreated right away
+            await cdp.send("Target.setDiscoverTargets", {"discover": True, "filter": _PAGE_TARGET_FILTER})
+            while True:
+                deadline = writer.due_at
+                if dirty_since is not None:
+                    debounce_at = dirty_since + SESSION_SAVE_DEBOUNCE
+                    deadline = debounce_at if deadline is None else min(deadline, debounce_at)
+                if deadline is None:
+                    timeout = SESSION_HEARTBEAT_INTERVAL
+                else:
+                    timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    event = await cdp.next_event(timeout)
+                except ConnectionError:
+                    logger.info(f"Browser session ended for profile: {profile_name}")
+                    if before_closing:
+                        await writer.offer(self._session_urls(before_closing))
+                    elif dirty_since is not None and pages:
+                        await writer.offer(self._session_urls(pages))
+                    break
+
+                if event is not None:
+                    closing = event.get("method") == "Target.targetDestroyed"
+                    if closing and before_closing is None:
+                        before_closing = dict(pages)
+                    if self._apply_target_event(pages, event):
+                        if not pages:
+                            logger.info(f"No more windows for profile: {profile_name}, exiting loop")
+                            if before_closing:
+                                await writer.offer(self._session_urls(before_closing))
+                            break
+                        if dirty_since is None or closing:
+                            # Each close restarts the debounce, so a window's
+                            # teardown is never taken for a finished change
+                            dirty_since = time.monotonic()
+                    continue
+
+                if dirty_since is None and writer.due_at is None:
+                    # Heartbeat: nothing happened for a while, make sure the browser is still there
+                    try:
+                        await cdp.send("Browser.getVersion")
+                    except (ConnectionError, asyncio.TimeoutError):
+                        logger.info(f"Browser session ended for profile: {profile_name}")
+                        break
+                    continue
+
+                if dirty_since is not None and time.monotonic() >= dirty_since + SESSION_SAVE_DEBOUNCE:
+                    # Tabs closed one by one while the browser stays open are a real change
+                    dirty_since = None
+                    before_closing = None
+                    await writer.offer(self._session_urls(pages))
+                await writer.flush_if_due()
+        except Exception as e:
+            logger.warning(f"CDP session monitoring failed for profile '{profile_name}', falling back to polling: {e}")
+            return False
+        finally:
+            await cdp.close()
+        return True
+
+    @staticmethod
+    def _browser_exited(service_proc, browser_proc: Optional[psutil.Process]) -> bool:
+        """Cheap liveness check on the chromedriver and browser processes"""
+        if service_proc is not None and service_proc.poll() is not None:
+            return True
+        if browser_proc is None:
+            return False
+        try:
+            # The browser is our child, so it lingers as a zombie until reaped
+            return not browser_proc.is_running() or browser_proc.status() == psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return True
+        except psutil.AccessDenied:
+            return False
+
+    async def _poll_session(
+        self,
+        driver,
+        browser_pid: Optional[int],
+        profile_name: str,
+        writer: _SessionWriter,
+    ) -> None:
+        """Fallback monitor: poll the driver until the browser closes
+
+        Polls quickly right after a tab change and backs off while the tabs stay the same.
+        Blocking driver calls run in the loop's executor so the shared loop stays free.
+        """
+        loop = asyncio.get_running_loop()
+        service_proc = getattr(getattr(driver, 'service', None), 'process', None)
+        browser_proc = None
+        if browser_pid:
+            try:
+                browser_proc = psutil.Process(browser_pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+        last_urls = None
+        last_change = time.monotonic()
+        # A recurring loop error is logged once until an iteration succeeds again
+        error_logged = False
+        while True:
+            if self._browser_exited(service_proc, browser_proc):
+                logger.info(f"Browser session ended for profile: {profile_name}")
+                break
+            try:
+                # One CDP call answers both "any windows left?" and "which URLs are open?"
+                targets = await loop.run_in_executor(
+                    None, driver.execute_cdp_cmd, "Target.getTargets", {"filter": _PAGE_TARGET_FILTER}
+                )
+                # Browsers without filter support ignore it, so keep the type check
+                pages = [t for t in targets.get("targetInfos", []) if t.get("type") == "page"]
+                if not pages:
+                    logger.info(f"No more windows for profile: {profile_name}, exiting loop")
+                    break
+
+                open_urls = [
+                    url for t in pages
+                    if (url := t.get("url")) not in _BLOCKED_EXACT
+                    and not url.startswith(_BLOCKED_PREFIXES)
+                ]
+                if open_urls != last_urls:
+                    last_urls = open_urls
+                    last_change = time.monotonic()
+                await writer.offer(open_urls)
+                error_logged = False
+            except Exception as e:
+                if not error_logged:
+                    error_logged = True
+                    logger.error(f"Error in session monitoring loop for profile '{profile_name}': {e}")
+                if browser_proc is None:
+                    # Nothing else tells us the browser is gone
+                    break
+                # The driver's current window may have been closed; reattach to the last one
+                try:
+                    await loop.run_in_executor(None, self._switch_to_last_window, driver)
+                except Exception:
+                    pass
+
+            idle = time.monotonic() - last_change
+            await asyncio.sleep(min(POLL_INTERVAL_MAX, max(POLL_INTERVAL_MIN, idle * 0.5)))
+
+    @staticmethod
+    def _switch_to_last_window(driver):
+        handles = driver.window_handles
+        if handles:
+            driver.switch_to.window(handles[-1])
+
+    def start(
         self,
         profile_dir: Path,
         profile_name: str,
@@ -35,34 +451,43 @@ class ChromeDriverEngine(EngineBase):
         register_process: Callable[[int], None],
         save_session: Callable[[Path, list], None],
         load_session: Callable[[Path], list],
-    ) -> None:
+    ) -> "_ChromeDriverSession":
         if uc is None:
             error_msg = 'undetected-chromedriver not available. Install with: pip install undetected-chromedriver'
             logger.error(error_msg)
             raise RuntimeError(error_msg)
 
+        profile_dir_str = os.fspath(profile_dir)
         options = uc.ChromeOptions()
-        args = DEFAULT_BROWSER_ARGS.copy()
-        if extra_args:
-            args.extend(extra_args)
+        # Per-profile switches; the defaults are an immutable tuple shared by every launch
         # user data dir
-        args.append(f"--user-data-dir={str(profile_dir)}")
+        tail = [f"--user-data-dir={profile_dir_str}"]
         # proxy
         if proxy:
             server = proxy.server if '://' in proxy.server else f"http://{proxy.server}"
-            args.append(f"--proxy-server={server}")
+            tail.append(f"--proxy-server={server}")
         # fingerprint basics
         if fingerprint:
-            args.append(f"--user-agent={fingerprint.user_agent}")
-            args.append(f"--lang={fingerprint.language}")
-        args.append('--start-maximized')
+            tail.append(f"--user-agent={fingerprint.user_agent}")
+            tail.append(f"--lang={fingerprint.language}")
+        tail.append('--start-maximized')
         if headless:
-            args.append('--headless=new')
+            tail.append('--headless=new')
+        args = (*DEFAULT_BROWSER_ARGS, *(a for a in extra_args or () if a), *tail)
+        # add_argument does not dedupe; skip switches the options already carry
+        seen = set(options.arguments)
         for a in args:
-            options.add_argument(a)
-            
+            if a not in seen:
+                seen.add(a)
+                options.add_argument(a)
+
         logger.info(f"Launching ChromeDriver for profile: {profile_name}")
-        driver = uc.Chrome(options=options)
+        # A pre-patched executable makes uc skip its download and patch step
+        driver_path = self._get_patched_driver_path()
+        if driver_path:
+            driver = uc.Chrome(options=options, driver_executable_path=driver_path)
+        else:
+            driver = uc.Chrome(options=options)
 
         # Get browser PID (prefer direct attribute if available)
         browser_pid = getattr(driver, 'browser_pid', None)
@@ -70,18 +495,7 @@ class ChromeDriverEngine(EngineBase):
         # Fallback: find top-level process by user-data-dir and executable name, exclude helper types
         if not browser_pid:
             try:
-                pdir_str = str(profile_dir)
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    try:
-                        name = (proc.info['name'] or '').lower()
-                        cmdline_list = proc.info['cmdline'] or []
-                        cmdline = ' '.join(cmdline_list)
-                        if pdir_str in cmdline and (('chrome' in name) or ('msedge' in name)):
-                            if not any(arg.startswith('--type=') for arg in cmdline_list):
-                                browser_pid = proc.info['pid']
-                                break
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
+                browser_pid = self._find_browser_pid(driver, profile_dir_str)
             except Exception as e:
                 logger.warning(f"Failed to find browser PID for profile '{profile_name}': {e}")
 
@@ -91,89 +505,71 @@ class ChromeDriverEngine(EngineBase):
         else:
             logger.warning(f"Could not determine browser PID for profile: {profile_name}")
 
+        debugger_address = self._debugger_address(driver)
+
         # Restore previous session
         if restore_session:
             saved_urls = load_session(profile_dir)
             if saved_urls:
-                try:
-                    logger.info(f"Restoring {len(saved_urls)} tabs for profile: {profile_name}")
-                    driver.get(saved_urls[0])
-                except Exception as e:
-                    logger.error(f"Failed to open first tab {saved_urls[0]} for profile '{profile_name}': {e}")
-                for url in saved_urls[1:]:
+                logger.info(f"Restoring {len(saved_urls)} tabs for profile: {profile_name}")
+                restored = False
+                if debugger_address:
+                    restored = self.run_coroutine(
+                        self._restore_tabs(debugger_address, saved_urls, profile_name)
+                    )
+                if not restored:
+                    # No direct DevTools connection: go through the driver instead
                     try:
-                        driver.execute_script(f"window.open('{url}','_blank')")
-                        time.sleep(0.1)
+                        driver.get(saved_urls[0])
                     except Exception as e:
-                        logger.warning(f"Failed to restore tab {url} for profile '{profile_name}': {e}")
-                # Focus a non-initial tab to keep session alive if first tab is closed
-                try:
-                    handles = driver.window_handles
-                    if handles:
-                        driver.switch_to.window(handles[-1])
-                except Exception as e:
-                    logger.warning(f"Failed to switch to last tab for profile '{profile_name}': {e}")
-
-        # Keep browser open and periodically save session state (robust)
-        last_saved = None
-        logger.info(f"Starting session monitoring for profile: {profile_name}")
-        while True:
-            try:
-                # Check if any windows remain; if none, exit loop
-                handles = driver.window_handles
-                if not handles:
-                    logger.info(f"No more windows for profile: {profile_name}, exiting loop")
-                    break
+                        logger.error(f"Failed to open first tab {saved_urls[0]} for profile '{profile_name}': {e}")
+                    for url in saved_urls[1:]:
+                        try:
+                            driver.execute_cdp_cmd("Target.createTarget", {"url": url, "background": True})
+                        except Exception as e:
+                            logger.warning(f"Failed to restore tab {url} for profile '{profile_name}': {e}")
 
-                # Try to save session from CDP targets without changing focus
-                try:
-                    targets = driver.execute_cdp_cmd("Target.getTargets", {})
-                    open_urls = []
-                    for t in targets.get("targetInfos", []):
-                        if t.get("type") == "page":
-                            url = t.get("url") or ""
-                            if url and url != 'about:blank' and not url.startswith('chrome://'):
-                                open_urls.append(url)
-                    if open_urls != last_saved:
-                        save_session(profile_dir, open_urls)
-                        last_saved = open_urls
-                        logger.debug(f"Saved {len(open_urls)} URLs for profile: {profile_name}")
-                except Exception as e:
-                    # Check if this is a session-related error that indicates the browser has closed
-                    error_str = str(e).lower()
-                    if 'invalid session id' in error_str or 'session deleted' in error_str:
-                        logger.info(f"Browser session ended for profile: {profile_name}")
-                        break
-                    logger.warning(f"Failed to save session for profile '{profile_name}': {e}")
+        writer = _SessionWriter(save_session, profile_dir, profile_name)
+        return _ChromeDriverSession(self, driver, browser_pid, debugger_address, profile_name, writer)
 
-            except Exception as e:
-                # Check if this is a session-related error that indicates the browser has closed
-                error_str = str(e).lower()
-                if 'invalid session id' in error_str or 'session deleted' in error_str:
-                    logger.info(f"Browser session ended for profile: {profile_name}")
-                    break
-                    
-                logger.error(f"Error in session monitoring loop for profile '{profile_name}': {e}")
-                # Attempt to recover by reattaching to last window if possible
-                try:
-                    handles = driver.window_handles
-                    if handles:
-                        driver.switch_to.window(handles[-1])
-                    else:
-                        break
-                except Exception as e2:
-                    # Check if this is a session-related error that indicates the browser has closed
-                    error_str2 = str(e2).lower()
-                    if 'invalid session id' in error_str2 or 'session deleted' in error_str2:
-                        logger.info(f"Browser session ended for profile: {profile_name}")
-                        break
-                    logger.error(f"Failed to recover session for profile '{profile_name}': {e2}")
-                    break
 
-            time.sleep(1.0)
+class _ChromeDriverSession(EngineSession):
+    """A running ChromeDriver browser; monitor() runs on the shared engine loop"""
+
+    def __init__(
+        self,
+        engine: ChromeDriverEngine,
+        driver,
+        browser_pid: Optional[int],
+        debugger_address: Optional[str],
+        profile_name: str,
+        writer: _SessionWriter,
+    ):
+        self._engine = engine
+        self._driver = driver
+        self._browser_pid = browser_pid
+        self._debugger_address = debugger_address
+        self._profile_name = profile_name
+        self._writer = writer
+
+    async def monitor(self) -> None:
+        logger.info(f"Starting session monitoring for profile: {self._profile_name}")
+        monitored = False
+        if self._debugger_address:
+            monitored = await self._engine._watch_session(
+                self._debugger_address, self._profile_name, self._writer
+            )
+        if not monitored:
+            await self._engine._poll_session(
+                self._driver, self._browser_pid, self._profile_name, self._writer
+            )
+
+    def close(self) -> None:
+        # Write a change that was still held back by the write interval
+        self._writer.flush()
 
-        logger.info(f"Shutting down driver for profile: {profile_name}")
+        logger.info(f"Shutting down driver for profile: {self._profile_name}")
         try:
-            driver.quit()
+            self._driver.quit()
         except Exception as e:
-            logger.warning(f"Error quitting driver for profile '{profile_name}': {e}")
+            logger.warning(f"Error quitting driver for profile '{self._profile_name}': {e}")
@@ -1,6 +1,9 @@
 """
 Engine base interface for browser engines
 """
+import asyncio
+import concurrent.futures
+import threading
 from pathlib import Path
 from typing import Optional, Callable
 
@@ -12,7 +15,30 @@ class EngineBase:
     """Base class for browser engines"""
     name: str = "base"
 
-    def run(
+    # One event loop thread shared by every engine instance for async I/O
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_lock = threading.Lock()
+
+    @staticmethod
+    def _event_loop() -> asyncio.AbstractEventLoop:
+        with EngineBase._loop_lock:
+            if EngineBase._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="engine-event-loop", daemon=True).start()
+                EngineBase._loop = loop
+            return EngineBase._loop
+
+    @staticmethod
+    def run_coroutine(coro):
+        """Run a coroutine on the shared engine loop and wait for its result"""
+        return EngineBase.submit(coro).result()
+
+    @staticmethod
+    def submit(coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the shared engine loop without waiting for it"""
+        return asyncio.run_coroutine_threadsafe(coro, EngineBase._event_loop())
+
+    def start(
         self,
         profile_dir: Path,
         profile_name: str,
@@ -24,6 +50,18 @@ class EngineBase:
         register_process: Callable[[int], None],
         save_session: Callable[[Path, list], None],
         load_session: Callable[[Path], list],
-    ) -> None:
-        """Run the browser synchronously. Implemented by concrete engines."""
+    ) -> "EngineSession":
+        """Launch the browser and return its session. Implemented by concrete engines."""
+        raise NotImplementedError
+
+
+class EngineSession:
+    """A launched browser, watched on the shared engine loop until it closes"""
+
+    async def monitor(self) -> None:
+        """Save the session until the browser closes"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Write any pending session state and shut the browser down"""
         raise NotImplementedError
@@ -1,15 +1,27 @@
 """
 Core profile management functionality
 """
-import json
+import atexit
+import errno
 import logging
+import mmap
+import os
+import re
 import shutil
+import sys
+import threading
 import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Dict, List, Callable, Any
-from functools import wraps
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Callable, Any, Iterable, Set
+from functools import wraps, lru_cache
+from contextlib import contextmanager, ExitStack
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 from src.config import PROFILES_DIR, METADATA_FILE
 from src.config_manager import config_manager
@@ -17,6 +29,9 @@ from src.config_manager import config_manager
 from src.core.browser_launcher import BrowserLauncher
 from src.utils.fingerprint_generator import BrowserFingerprint, FingerprintGenerator
 from src.utils.proxy_manager import ProxyConfig
+from src.utils import json_codec
+from src.utils.cache_cleaner import CacheCleaner
+from src.utils.dir_size import dir_size
 
 logger = logging.getLogger(__name__)
 
@@ -41,19 +56,180 @@ class ProfileValidationError(ProfileError):
     """Raised when profile data validation fails"""
     pass
 
+
+def _utc_now_iso() -> str:
+    """Current UTC time in the stored format: naive ISO 8601, as utcnow().isoformat() gave"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# Directory under the profiles dir where deleted profiles await removal
+TRASH_DIR_NAME = ".trash"
+
+# Notes, fingerprint and proxy config kept inside each profile directory
+PROFILE_FILE_NAME = "profile.json"
+# Per-profile files that profile.json replaces
+_LEGACY_PROFILE_FILES = ("notes.txt", "fingerprint.json", "proxy.json")
+
+
+# Whitespace runs become a single underscore in directory names
+_WHITESPACE_RE = re.compile(r'\s+')
+# Path separators or parent references that would escape the profiles dir
+_UNSAFE_NAME_RE = re.compile(r'\.\.|[/\\]')
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_name(name: str) -> str:
+    """Directory name for a profile; raises ProfileValidationError for unsafe names"""
+    stripped = name.strip()
+    if not stripped:
+        raise ProfileValidationError("Profile name cannot be empty")
+
+    # Sanitize name to prevent directory traversal
+    safe = _WHITESPACE_RE.sub('_', stripped)
+    if _UNSAFE_NAME_RE.search(safe):
+        raise ProfileValidationError("Profile name contains invalid characters")
+    if safe == TRASH_DIR_NAME:
+        raise ProfileValidationError(f"Profile name '{name}' is reserved")
+    return safe
+
+
+@lru_cache(maxsize=1024)
+def _profile_path_in(profiles_dir: str, name: str) -> str:
+    """Directory of a profile under profiles_dir, as a plain string"""
+    return os.path.join(profiles_dir, _sanitize_name(name))
+
+
+# Upper bound on threads used to size one profile's subdirectories
+SIZE_WORKERS = 8
+
+
+def _parallel_dir_size(path: str) -> int:
+    """Like dir_size, but sizes the top-level subdirectories on a thread pool"""
+    total = 0
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+            except FileNotFoundError:
+                continue
+    if len(subdirs) < 2:
+        return total + sum(dir_size(d) for d in subdirs)
+
+    # stat() releases the GIL, so the walks overlap on I/O
+    with ThreadPoolExecutor(max_workers=min(SIZE_WORKERS, len(subdirs))) as executor:
+        return total + sum(executor.map(dir_size, subdirs))
+
+
+# Upper bound on threads used to remove one profile's subdirectories
+DELETE_WORKERS = 8
+
+
+def _remove_tree(path: str):
+    """shutil.rmtree(ignore_errors=True), removing top-level subdirectories in parallel"""
+    try:
+        with os.scandir(path) as it:
+            subdirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        subdirs = []
+    if len(subdirs) > 1:
+        # unlink() releases the GIL, so the removals overlap on I/O
+        with ThreadPoolExecutor(max_workers=min(DELETE_WORKERS, len(subdirs))) as executor:
+            for subdir in subdirs:
+                executor.submit(shutil.rmtree, subdir, ignore_errors=True)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _empty_trash(trash_dir: str):
+    """Remove everything moved to trash_dir, including leftovers of earlier runs"""
+    try:
+        with os.scandir(trash_dir) as it:
+            doomed = [entry.path for entry in it]
+    except OSError:
+        return
+    for path in doomed:
+        _remove_tree(path)
+
+
+# FICLONE ioctl from linux/fs.h; the fcntl module only exposes it from Python 3.12
+_FICLONE = getattr(fcntl, 'FICLONE', 0x40049409)
+# Cleared after the first clone the filesystem rejects
+_reflink_supported = fcntl is not None and sys.platform.startswith('linux')
+_REFLINK_UNSUPPORTED_ERRNOS = (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS)
+
+
+# Flags for _write_file; O_BINARY only exists (and matters) on Windows
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_file(path: str, data: bytes):
+    """Write data with bare open/write/close calls, skipping the buffered file object"""
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+# Browser cache directories (relative to a profile dir) left out of duplicates
+_DUPLICATE_SKIP_DIRS = frozenset(
+    os.path.normpath(os.path.join(base, cache_dir))
+    for base in ('', 'Default')
+    for cache_dir in CacheCleaner.CACHE_DIRS
+)
+
+
+def _skip_cache_dirs(source_root: str) -> Callable[[str, List[str]], Set[str]]:
+    """copytree ignore callback that leaves out the browser caches under source_root"""
+    def ignore(directory: str, names: List[str]) -> Set[str]:
+        rel = os.path.relpath(directory, source_root)
+        return {name for name in names
+                if os.path.normpath(os.path.join(rel, name)) in _DUPLICATE_SKIP_DIRS}
+    return ignore
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """copytree copy_function: copy-on-write clone where the filesystem supports it, else copy2"""
+    global _reflink_supported
+    if _reflink_supported:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError as e:
+                if e.errno not in _REFLINK_UNSUPPORTED_ERRNOS:
+                    raise
+                _reflink_supported = False
+                cloned = False
+        if cloned:
+            shutil.copystat(src, dst)
+            return dst
+    return shutil.copy2(src, dst)
+
+
 class ProfileMetadata:
     """Metadata for a browser profile"""
+    __slots__ = ('name', 'created', 'path', 'fingerprint', 'proxy', 'notes', 'engine', 'last_launched')
+
     def __init__(self, name: str, created: str, path: str, fingerprint: Optional[Dict] = None,
                  proxy: Optional[Dict] = None, notes: str = "", engine: str = "chromedriver",
-                 last_launched: str = ""):
+                 last_launched: str = "", default_engine: Optional[str] = None):
         self.name = name
         self.created = created
         self.path = path
         self.fingerprint = fingerprint
         self.proxy = proxy
         self.notes = notes
-        # Use profile-specific engine setting, fallback to global config, then default to chromedriver
-        self.engine = engine if engine != "chromedriver" else config_manager.get_str("browser_engine", engine)
+        # Use profile-specific engine setting, fallback to global config, then default to chromedriver.
+        # Bulk loaders pass default_engine so the config is consulted once, not per profile
+        if engine == "chromedriver":
+            engine = default_engine if default_engine is not None else config_manager.get_str("browser_engine", engine)
+        self.engine = engine
         self.last_launched = last_launched
 
     def to_dict(self) -> dict:
@@ -69,7 +245,7 @@ class ProfileMetadata:
         }
 
     @staticmethod
-    def from_dict(data: dict) -> 'ProfileMetadata':
+    def from_dict(data: dict, default_engine: Optional[str] = None) -> 'ProfileMetadata':
         return ProfileMetadata(
             name=data.get('name', ''),
             created=data.get('created', ''),
@@ -78,7 +254,8 @@ class ProfileMetadata:
             proxy=data.get('proxy'),
             notes=data.get('notes', ''),
             engine=data.get('engine', 'chromedriver'),
-            last_launched=data.get('last_launched', '')
+            last_launched=data.get('last_launched', ''),
+            default_engine=default_engine
         )
 
     def get_instance_state(self) -> Dict[str, any]:
@@ -94,7 +271,7 @@ class ProfileMetadata:
             process = active_processes.get(self.name)
             if process:
                 pid = process.pid
-                start_time = process.started_at.isoformat() if process.started_at else None
+                start_time = process.started_at_iso
         
         return {
             'profile_name': self.name,
@@ -123,16 +300,38 @@ class ProfileMetadata:
 class ProfileManager:
     """Manages browser profiles with fingerprints and proxies"""
 
+    # Seconds to coalesce metadata changes before writing them to disk
+    METADATA_FLUSH_DELAY = 1.0
+    # Smaller metadata files are read() (mapping costs more than the copy);
+    # empty files cannot be mapped at all
+    METADATA_MMAP_MIN_SIZE = 64 * 1024
+
     def __init__(self):
         self.profiles_dir = PROFILES_DIR
+        self._profiles_dir_str = os.fspath(PROFILES_DIR)
         self.metadata_file = METADATA_FILE
+        # In-memory metadata is the source of truth; the file is refreshed from
+        # it by a delayed flush. Reloaded from disk only when the file changed
+        # externally, i.e. its (mtime_ns, size) differs and nothing is unsaved
+        self._cache: Optional[Dict[str, ProfileMetadata]] = None
+        self._cache_stamp: Optional[tuple] = None
+        self._dirty = False
+        # Encoded JSON of each cached entry and the names whose encoding is
+        # out of date (None: all of them), so a flush re-encodes only edits
+        self._encoded: Dict[str, bytes] = {}
+        self._stale: Optional[Set[str]] = None
+        self._metadata_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
+        # Nesting depth of batch() blocks
+        self._batch_depth = 0
         self._ensure_metadata()
 
     def _ensure_metadata(self):
         """Ensure metadata file exists"""
         try:
             if not self.metadata_file.exists():
-                self._save_metadata({})
+                self._write_metadata({})
         except Exception as e:
             logger.error(f"Failed to ensure metadata file exists: {e}")
             raise ProfileIOError(f"Could not initialize metadata file: {str(e)}") from e
@@ -157,43 +356,215 @@ class ProfileManager:
                 raise ProfileError(f"Unexpected error in {func.__name__}: {str(e)}") from e
         return wrapper
 
-    @_handle_io_errors
+    def _metadata_stamp(self, fd: Optional[int] = None) -> tuple:
+        """(mtime_ns, size) of the metadata file, or of an open descriptor to it"""
+        st = os.stat(self.metadata_file) if fd is None else os.fstat(fd)
+        return st.st_mtime_ns, st.st_size
+
     def _load_metadata(self) -> Dict[str, ProfileMetadata]:
-        """Load profiles metadata"""
+        """Load profiles metadata (cached until the file changes on disk)"""
+        # Cache hits are checked here without the error-mapping wrapper
+        with self._metadata_lock:
+            cache = self._cache
+            if cache is not None:
+                if self._dirty:
+                    return cache
+                try:
+                    if self._metadata_stamp() == self._cache_stamp:
+                        return cache
+                except OSError:
+                    pass
+            return self._reload_metadata()
+
+    @_handle_io_errors
+    def _reload_metadata(self) -> Dict[str, ProfileMetadata]:
+        """Parse the metadata file and replace the cache"""
         try:
-            with open(self.metadata_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return {name: ProfileMetadata.from_dict(meta) for name, meta in data.items()}
+            with self._metadata_lock:
+                with open(self.metadata_file, "rb") as f:
+                    # Stamp the file that is actually parsed, even if it is replaced meanwhile
+                    stamp = self._metadata_stamp(f.fileno())
+                    if stamp[1] >= self.METADATA_MMAP_MIN_SIZE:
+                        # Parse straight from the page cache instead of copying the file
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                            data = json_codec.loads(view)
+                    else:
+                        data = json_codec.loads(f.read())
+                default_engine = config_manager.get_str("browser_engine", "chromedriver")
+                metadata = {name: ProfileMetadata.from_dict(meta, default_engine) for name, meta in data.items()}
+                self._cache = metadata
+                self._cache_stamp = stamp
+                self._encoded = {}
+                self._stale = None
+                return metadata
         except FileNotFoundError:
             logger.warning(f"Metadata file not found: {self.metadata_file}")
             return {}
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"Invalid JSON in metadata file: {e}")
             raise ProfileIOError(f"Corrupted metadata file: {str(e)}") from e
 
-    @_handle_io_errors
-    def _save_metadata(self, metadata: Dict[str, ProfileMetadata]):
-        """Save profiles metadata"""
-        data = {name: meta.to_dict() for name, meta in metadata.items()}
-        with open(self.metadata_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def _save_metadata(self, metadata: Dict[str, ProfileMetadata], changed: Optional[Iterable[str]] = None):
+        """Make metadata current; it is written to disk shortly after (or when a batch() ends)
+
+        changed names the entries that were added, edited or removed; without
+        it every entry is re-encoded on the next write.
+        """
+        with self._metadata_lock:
+            if changed is None or metadata is not self._cache:
+                self._stale = None
+            elif self._stale is not None:
+                self._stale.update(changed)
+            self._cache = metadata
+            self._dirty = True
+            if not self._batch_depth:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        with self._metadata_lock:
+            if not self._atexit_registered:
+                atexit.register(self.flush_pending)
+                self._atexit_registered = True
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.METADATA_FLUSH_DELAY, self.flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _encode_metadata(self, metadata: Dict[str, ProfileMetadata]) -> bytes:
+        """Encode metadata, reusing the cached JSON of entries that did not change
+
+        Produces the same 2-space indented document as encoding the whole dict.
+        """
+        stale = self._stale
+        encoded = {}
+        for name, meta in list(metadata.items()):
+            chunk = None if stale is None or name in stale else self._encoded.get(name)
+            if chunk is None:
+                # Nest the entry one level deeper inside the top-level object
+                chunk = json_codec.dumps(meta.to_dict()).replace(b"\n", b"\n  ")
+            encoded[name] = chunk
+        self._encoded = encoded
+        self._stale = set()
+        if not encoded:
+            return b"{}"
+        return b"{\n" + b",\n".join(
+            b"  " + json_codec.dumps(name, indent=False) + b": " + chunk
+            for name, chunk in encoded.items()
+        ) + b"\n}"
+
+    def _write_metadata(self, metadata: Dict[str, ProfileMetadata]):
+        """Atomically replace the metadata file"""
+        if metadata is not self._cache:
+            self._stale = None
+        data = self._encode_metadata(metadata)
+        tmp_file = self.metadata_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                # os.replace keeps the inode, so this is the new file's stamp
+                stamp = self._metadata_stamp(f.fileno())
+            os.replace(tmp_file, self.metadata_file)
+        except BaseException:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+        self._cache = metadata
+        self._cache_stamp = stamp
+
+    @contextmanager
+    def batch(self):
+        """Group several metadata changes into a single write
+
+        Usage: with profile_manager.batch(): ...
+        """
+        with self._metadata_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._metadata_lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self.flush_pending()
+
+    def touch_last_launched(self, name: str):
+        """Record a launch time; metadata is written shortly after"""
+        with self._metadata_lock:
+            metadata = self._load_metadata()
+            profile = metadata.get(name)
+            if profile is not None:
+                profile.last_launched = _utc_now_iso()
+                self._save_metadata(metadata, changed=(name,))
+
+    def flush_pending(self):
+        """Write unsaved metadata changes to disk"""
+        with self._metadata_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty or self._cache is None:
+                return
+            try:
+                self._write_metadata(self._cache)
+                self._dirty = False
+            except Exception as e:
+                # Keep the changes in memory; the next change or flush retries
+                logger.error(f"Failed to write profile metadata: {e}")
+
+    @staticmethod
+    def _write_profile_file(pdir: str, profile: ProfileMetadata):
+        """Write the profile's notes, fingerprint and proxy config as one profile.json"""
+        _write_file(os.path.join(pdir, PROFILE_FILE_NAME), json_codec.dumps({
+            'name': profile.name,
+            'created': profile.created,
+            'notes': profile.notes,
+            'fingerprint': profile.fingerprint,
+            'proxy': profile.proxy
+        }))
+
+    @staticmethod
+    def _remove_legacy_profile_files(pdir: str):
+        """Drop the separate notes/fingerprint/proxy files once profile.json supersedes them"""
+        for file_name in _LEGACY_PROFILE_FILES:
+            try:
+                os.remove(os.path.join(pdir, file_name))
+            except FileNotFoundError:
+                pass
 
     def profile_dir(self, name: str) -> Path:
         """Get profile directory path"""
-        if not name.strip():
-            raise ProfileValidationError("Profile name cannot be empty")
-        
-        # Sanitize name to prevent directory traversal
-        safe = "_".join(name.split())
-        if ".." in safe or "/" in safe or "\\" in safe:
-            raise ProfileValidationError("Profile name contains invalid characters")
-            
-        return self.profiles_dir / safe
+        return Path(_profile_path_in(self._profiles_dir_str, name))
+
+    def _profile_path(self, name: str) -> str:
+        """Profile directory as a plain string for internal filesystem calls"""
+        return _profile_path_in(self._profiles_dir_str, name)
 
     def list_profiles(self) -> Dict[str, ProfileMetadata]:
         """Get all profiles"""
         return self._load_metadata()
 
+    def get_all_instance_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get the instance state of every profile from one process snapshot"""
+        active_processes = BrowserLauncher.get_active_processes()
+        names = list(self._load_metadata())
+        # Untracked profiles still get the external-browser fallback check
+        running = BrowserLauncher.running_profiles(
+            name for name in names if name not in active_processes)
+        states = {}
+        for name in names:
+            process = active_processes.get(name)
+            states[name] = {
+                'profile_name': name,
+                'is_running': process is not None or name in running,
+                'pid': process.pid if process else None,
+                'start_time': process.started_at_iso if process else None
+            }
+        return states
+
     def get_profile(self, name: str) -> Optional[ProfileMetadata]:
         """Get specific profile metadata"""
         metadata = self._load_metadata()
@@ -209,70 +580,8 @@ class ProfileManager:
             engine: str = "chromedriver"
     ) -> bool:
         """Create new profile with fingerprint and optional proxy"""
-        try:
-            pdir = self.profile_dir(name)
-            if pdir.exists():
-                logger.warning(f"Profile directory already exists: {pdir}")
-                raise ProfileAlreadyExistsError(f"Profile '{name}' already exists")
-
-            # Create directory
-            pdir.mkdir(parents=True)
-
-            # Generate fingerprint
-            fingerprint = FingerprintGenerator.generate(os_type, custom_user_agent)
-
-            # Create notes file
-            notes_content = f"Profile created: {datetime.utcnow().isoformat()}\n"
-            if notes:
-                notes_content += f"\nNotes:\n{notes}\n"
-            (pdir / "notes.txt").write_text(notes_content, encoding='utf-8')
-
-            # Save fingerprint to profile directory
-            (pdir / "fingerprint.json").write_text(
-                json.dumps(fingerprint.to_dict(), indent=2),
-                encoding='utf-8'
-            )
-
-            # Save proxy config if provided
-            if proxy:
-                (pdir / "proxy.json").write_text(
-                    json.dumps(proxy.to_dict(), indent=2),
-                    encoding='utf-8'
-                )
+        return self._create(name, None, proxy, notes, engine, os_type, custom_user_agent)
 
-            # Update metadata
-            metadata = self._load_metadata()
-            metadata[name] = ProfileMetadata(
-                name=name,
-                created=datetime.utcnow().isoformat(),
-                path=str(pdir),
-                fingerprint=fingerprint.to_dict(),
-                proxy=proxy.to_dict() if proxy else None,
-                notes=notes,
-                engine=engine
-            )
-            self._save_metadata(metadata)
-
-            logger.info(f"Successfully created profile: {name}")
-            return True
-        except PermissionError as e:
-            logger.error(f"Permission denied creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileIOError(f"Permission denied creating profile '{name}': {str(e)}") from e
-        except OSError as e:
-            logger.error(f"OS error creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileIOError(f"System error creating profile '{name}': {str(e)}") from e
-        except Exception as e:
-            logger.error(f"Unexpected error creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileError(f"Failed to create profile '{name}': {str(e)}") from e
     # В profile_manager.py добавить метод:
     def create_profile_with_fingerprint(
             self,
@@ -285,72 +594,65 @@ class ProfileManager:
             engine: str = "chromedriver"
         ) -> bool:
         """Create new profile with direct fingerprint"""
-        try:
-            pdir = self.profile_dir(name)
-            if pdir.exists():
-                logger.warning(f"Profile directory already exists: {pdir}")
-                raise ProfileAlreadyExistsError(f"Profile '{name}' already exists")
-
-            # Create directory
-            pdir.mkdir(parents=True)
-
-            # Generate or use provided fingerprint
-            if not fingerprint:
-                fingerprint = FingerprintGenerator.generate(os_type, custom_user_agent)
-
-            # Create notes file
-            notes_content = f"Profile created: {datetime.utcnow().isoformat()}\n"
-            if notes:
-                notes_content += f"\nNotes:\n{notes}\n"
-            (pdir / "notes.txt").write_text(notes_content, encoding='utf-8')
-
-            # Save fingerprint to profile directory
-            (pdir / "fingerprint.json").write_text(
-                json.dumps(fingerprint.to_dict(), indent=2),
-                encoding='utf-8'
-            )
-
-            # Save proxy config if provided
-            if proxy:
-                (pdir / "proxy.json").write_text(
-                    json.dumps(proxy.to_dict(), indent=2),
-                    encoding='utf-8'
+        return self._create(name, fingerprint, proxy, notes, engine, os_type, custom_user_agent)
+
+    def _create(
+            self,
+            name: str,
+            fingerprint: Optional[BrowserFingerprint],
+            proxy: Optional[ProxyConfig],
+            notes: str,
+            engine: str,
+            os_type: str = 'windows',
+            custom_user_agent: Optional[str] = None
+    ) -> bool:
+        """Create a profile; a fingerprint is generated for os_type unless one is given"""
+        # Directories registered here are removed again if creation fails
+        with ExitStack() as cleanup:
+            try:
+                pdir = self._profile_path(name)
+                if os.path.exists(pdir):
+                    logger.warning(f"Profile directory already exists: {pdir}")
+                    raise ProfileAlreadyExistsError(f"Profile '{name}' already exists")
+
+                # Create directory
+                os.makedirs(pdir)
+                cleanup.callback(shutil.rmtree, pdir, ignore_errors=True)
+
+                # Generate or use provided fingerprint
+                if not fingerprint:
+                    fingerprint = FingerprintGenerator.generate(os_type, custom_user_agent)
+
+                # Each dict is built once and shared by profile.json and the metadata entry
+                entry = ProfileMetadata(
+                    name=name,
+                    created=_utc_now_iso(),
+                    path=pdir,
+                    fingerprint=fingerprint.to_dict(),
+                    proxy=proxy.to_dict() if proxy else None,
+                    notes=notes,
+                    engine=engine
                 )
+                self._write_profile_file(pdir, entry)
+
+                # Update metadata
+                metadata = self._load_metadata()
+                metadata[name] = entry
+                self._save_metadata(metadata, changed=(name,))
+
+                cleanup.pop_all()
+                logger.info(f"Successfully created profile: {name}")
+                return True
+            except PermissionError as e:
+                logger.error(f"Permission denied creating profile '{name}': {e}")
+                raise ProfileIOError(f"Permission denied creating profile '{name}': {str(e)}") from e
+            except OSError as e:
+                logger.error(f"OS error creating profile '{name}': {e}")
+                raise ProfileIOError(f"System error creating profile '{name}': {str(e)}") from e
+            except Exception as e:
+                logger.error(f"Unexpected error creating profile '{name}': {e}")
+                raise ProfileError(f"Failed to create profile '{name}': {str(e)}") from e
 
-            # Update metadata
-            metadata = self._load_metadata()
-            metadata[name] = ProfileMetadata(
-                name=name,
-                created=datetime.utcnow().isoformat(),
-                path=str(pdir),
-                fingerprint=fingerprint.to_dict(),
-                proxy=proxy.to_dict() if proxy else None,
-                notes=notes,
-                engine=engine
-            )
-            self._save_metadata(metadata)
-            
-            logger.info(f"Successfully created profile with fingerprint: {name}")
-            return True
-        except PermissionError as e:
-            logger.error(f"Permission denied creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileIOError(f"Permission denied creating profile '{name}': {str(e)}") from e
-        except OSError as e:
-            logger.error(f"OS error creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileIOError(f"System error creating profile '{name}': {str(e)}") from e
-        except Exception as e:
-            logger.error(f"Unexpected error creating profile '{name}': {e}")
-            # Clean up partially created profile directory
-            if 'pdir' in locals() and pdir.exists():
-                shutil.rmtree(pdir, ignore_errors=True)
-            raise ProfileError(f"Failed to create profile '{name}': {str(e)}") from e
-            
     def update_profile(
             self,
             name: str,
@@ -366,35 +668,42 @@ class ProfileManager:
                 logger.warning(f"Profile '{name}' not found for update")
                 raise ProfileNotFoundError(f"Profile '{name}' not found")
 
-            pdir = self.profile_dir(name)
+            pdir = self._profile_path(name)
             profile = metadata[name]
+            # Values equal to the current ones are skipped, so saving an
+            # unchanged form rewrites nothing; the engine is not in profile.json
+            file_changed = False
+            engine_changed = False
 
             # Update fingerprint
             if fingerprint:
-                profile.fingerprint = fingerprint.to_dict()
-                (pdir / "fingerprint.json").write_text(
-                    json.dumps(fingerprint.to_dict(), indent=2),
-                    encoding='utf-8'
-                )
+                fingerprint_dict = fingerprint.to_dict()
+                if fingerprint_dict != profile.fingerprint:
+                    profile.fingerprint = fingerprint_dict
+                    file_changed = True
 
             # Update proxy
             if proxy is not None:
-                profile.proxy = proxy.to_dict()
-                (pdir / "proxy.json").write_text(
-                    json.dumps(proxy.to_dict(), indent=2),
-                    encoding='utf-8'
-                )
+                proxy_dict = proxy.to_dict()
+                if proxy_dict != profile.proxy:
+                    profile.proxy = proxy_dict
+                    file_changed = True
 
             # Update notes
-            if notes is not None:
+            if notes is not None and notes != profile.notes:
                 profile.notes = notes
-                (pdir / "notes.txt").write_text(notes, encoding='utf-8')
+                file_changed = True
 
             # Update engine
-            if engine is not None:
+            if engine is not None and engine != profile.engine:
                 profile.engine = engine
+                engine_changed = True
 
-            self._save_metadata(metadata)
+            if file_changed:
+                self._write_profile_file(pdir, profile)
+                self._remove_legacy_profile_files(pdir)
+            if file_changed or engine_changed:
+                self._save_metadata(metadata, changed=(name,))
             logger.info(f"Successfully updated profile: {name}")
             return True
         except PermissionError as e:
@@ -407,20 +716,26 @@ class ProfileManager:
             logger.error(f"Unexpected error updating profile '{name}': {e}")
             raise ProfileError(f"Failed to update profile '{name}': {str(e)}") from e
 
-    def delete_profile(self, name: str) -> bool:
-        """Delete profile and all its data"""
+    def delete_profile(self, name: str, wait: bool = True) -> bool:
+        """Delete profile and all its data
+
+        With wait=False the directory is moved aside and removed in the
+        background, so the call returns as soon as the profile is gone
+        from the list.
+        """
         try:
-            pdir = self.profile_dir(name)
-            if not pdir.exists():
+            pdir = self._profile_path(name)
+            if not os.path.exists(pdir):
                 logger.warning(f"Profile directory does not exist: {pdir}")
                 raise ProfileNotFoundError(f"Profile '{name}' not found")
 
             metadata = self._load_metadata()
             if name in metadata:
                 del metadata[name]
-                self._save_metadata(metadata)
+                self._save_metadata(metadata, changed=(name,))
 
-            shutil.rmtree(pdir, ignore_errors=True)
+            if wait or not self._move_to_trash(pdir):
+                _remove_tree(pdir)
             logger.info(f"Successfully deleted profile: {name}")
             return True
         except PermissionError as e:
@@ -433,29 +748,44 @@ class ProfileManager:
             logger.error(f"Unexpected error deleting profile '{name}': {e}")
             raise ProfileError(f"Failed to delete profile '{name}': {str(e)}") from e
 
+    def _move_to_trash(self, pdir: str) -> bool:
+        """Move a profile directory into the trash and empty it on a background thread
+
+        Returns False if the directory could not be moved (e.g. files in use on Windows).
+        """
+        trash_dir = os.path.join(self._profiles_dir_str, TRASH_DIR_NAME)
+        try:
+            os.makedirs(trash_dir, exist_ok=True)
+            os.replace(pdir, os.path.join(trash_dir, f"{os.path.basename(pdir)}-{time.time_ns()}"))
+        except OSError as e:
+            logger.debug(f"Could not move {pdir} to trash: {e}")
+            return False
+        threading.Thread(target=_empty_trash, args=(trash_dir,), name="profile-trash", daemon=True).start()
+        return True
+
     def rename_profile(self, old_name: str, new_name: str) -> bool:
         """Rename profile"""
         try:
-            old_dir = self.profile_dir(old_name)
-            new_dir = self.profile_dir(new_name)
+            old_dir = self._profile_path(old_name)
+            new_dir = self._profile_path(new_name)
 
-            if not old_dir.exists():
+            if not os.path.exists(old_dir):
                 logger.warning(f"Source profile directory does not exist: {old_dir}")
                 raise ProfileNotFoundError(f"Source profile '{old_name}' not found")
                 
-            if new_dir.exists():
+            if os.path.exists(new_dir):
                 logger.warning(f"Target profile directory already exists: {new_dir}")
                 raise ProfileAlreadyExistsError(f"Target profile '{new_name}' already exists")
 
-            old_dir.rename(new_dir)
+            os.rename(old_dir, new_dir)
 
             metadata = self._load_metadata()
             if old_name in metadata:
                 profile = metadata.pop(old_name)
                 profile.name = new_name
-                profile.path = str(new_dir)
+                profile.path = new_dir
                 metadata[new_name] = profile
-                self._save_metadata(metadata)
+                self._save_metadata(metadata, changed=(old_name, new_name))
 
             logger.info(f"Successfully renamed profile from '{old_name}' to '{new_name}'")
             return True
@@ -471,81 +801,70 @@ class ProfileManager:
 
     def duplicate_profile(self, source_name: str, new_name: str) -> bool:
         """Duplicate existing profile with new fingerprint"""
-        try:
-            source_dir = self.profile_dir(source_name)
-            new_dir = self.profile_dir(new_name)
+        # Directories registered here are removed again if duplication fails
+        with ExitStack() as cleanup:
+            try:
+                source_dir = self._profile_path(source_name)
+                new_dir = self._profile_path(new_name)
 
-            if not source_dir.exists():
-                logger.warning(f"Source profile directory does not exist: {source_dir}")
-                raise ProfileNotFoundError(f"Source profile '{source_name}' not found")
+                if not os.path.exists(source_dir):
+                    logger.warning(f"Source profile directory does not exist: {source_dir}")
+                    raise ProfileNotFoundError(f"Source profile '{source_name}' not found")
                 
-            if new_dir.exists():
-                logger.warning(f"Target profile directory already exists: {new_dir}")
-                raise ProfileAlreadyExistsError(f"Target profile '{new_name}' already exists")
-
-            # Copy directory
-            shutil.copytree(source_dir, new_dir)
-
-            # Load source metadata
-            metadata = self._load_metadata()
-            source_profile = metadata.get(source_name)
-
-            if source_profile:
-                # Generate new fingerprint for duplicate
-                os_type = 'windows'  # Default, could be detected from source
-                new_fingerprint = FingerprintGenerator.generate(os_type)
-
-                # Save new fingerprint
-                (new_dir / "fingerprint.json").write_text(
-                    json.dumps(new_fingerprint.to_dict(), indent=2),
-                    encoding='utf-8'
-                )
-
-                # Create new profile metadata
-                metadata[new_name] = ProfileMetadata(
-                    name=new_name,
-                    created=datetime.utcnow().isoformat(),
-                    path=str(new_dir),
-                    fingerprint=new_fingerprint.to_dict(),
-                    proxy=source_profile.proxy,  # Keep same proxy
-                    notes=f"Duplicated from: {source_name}\n{source_profile.notes}"
-                )
-                self._save_metadata(metadata)
+                if os.path.exists(new_dir):
+                    logger.warning(f"Target profile directory already exists: {new_dir}")
+                    raise ProfileAlreadyExistsError(f"Target profile '{new_name}' already exists")
+
+                # Copy directory without browser caches (cloned on btrfs/XFS and other CoW filesystems)
+                cleanup.callback(shutil.rmtree, new_dir, ignore_errors=True)
+                shutil.copytree(source_dir, new_dir, ignore=_skip_cache_dirs(source_dir),
+                                copy_function=_clone_file)
+
+                # Load source metadata
+                metadata = self._load_metadata()
+                source_profile = metadata.get(source_name)
+
+                if source_profile:
+                    # Generate new fingerprint for duplicate
+                    os_type = 'windows'  # Default, could be detected from source
+                    new_fingerprint = FingerprintGenerator.generate(os_type)
+
+                    # Create new profile metadata and its profile.json
+                    entry = ProfileMetadata(
+                        name=new_name,
+                        created=_utc_now_iso(),
+                        path=new_dir,
+                        fingerprint=new_fingerprint.to_dict(),
+                        proxy=source_profile.proxy,  # Keep same proxy
+                        notes=f"Duplicated from: {source_name}\n{source_profile.notes}"
+                    )
+                    self._write_profile_file(new_dir, entry)
+                    self._remove_legacy_profile_files(new_dir)
+                    metadata[new_name] = entry
+                    self._save_metadata(metadata, changed=(new_name,))
                 
-            logger.info(f"Successfully duplicated profile from '{source_name}' to '{new_name}'")
-            return True
-        except PermissionError as e:
-            logger.error(f"Permission denied duplicating profile '{source_name}' to '{new_name}': {e}")
-            # Clean up partially created profile directory
-            if 'new_dir' in locals() and new_dir.exists():
-                shutil.rmtree(new_dir, ignore_errors=True)
-            raise ProfileIOError(f"Permission denied duplicating profile: {str(e)}") from e
-        except OSError as e:
-            logger.error(f"OS error duplicating profile '{source_name}' to '{new_name}': {e}")
-            # Clean up partially created profile directory
-            if 'new_dir' in locals() and new_dir.exists():
-                shutil.rmtree(new_dir, ignore_errors=True)
-            raise ProfileIOError(f"System error duplicating profile: {str(e)}") from e
-        except Exception as e:
-            logger.error(f"Unexpected error duplicating profile '{source_name}' to '{new_name}': {e}")
-            # Clean up partially created profile directory
-            if 'new_dir' in locals() and new_dir.exists():
-                shutil.rmtree(new_dir, ignore_errors=True)
-            raise ProfileError(f"Failed to duplicate profile: {str(e)}") from e
+                cleanup.pop_all()
+                logger.info(f"Successfully duplicated profile from '{source_name}' to '{new_name}'")
+                return True
+            except PermissionError as e:
+                logger.error(f"Permission denied duplicating profile '{source_name}' to '{new_name}': {e}")
+                raise ProfileIOError(f"Permission denied duplicating profile: {str(e)}") from e
+            except OSError as e:
+                logger.error(f"OS error duplicating profile '{source_name}' to '{new_name}': {e}")
+                raise ProfileIOError(f"System error duplicating profile: {str(e)}") from e
+            except Exception as e:
+                logger.error(f"Unexpected error duplicating profile '{source_name}' to '{new_name}': {e}")
+                raise ProfileError(f"Failed to duplicate profile: {str(e)}") from e
 
     def get_profile_size(self, name: str) -> int:
         """Get profile directory size in bytes"""
         try:
-            pdir = self.profile_dir(name)
-            if not pdir.exists():
+            pdir = self._profile_path(name)
+            if not os.path.exists(pdir):
                 logger.warning(f"Profile directory does not exist when getting size: {pdir}")
                 raise ProfileNotFoundError(f"Profile '{name}' not found")
 
-            total = 0
-            for f in pdir.rglob('*'):
-                if f.is_file():
-                    total += f.stat().st_size
-            return total
+            return _parallel_dir_size(pdir)
         except PermissionError as e:
             logger.error(f"Permission denied accessing profile '{name}' directory: {e}")
             raise ProfileIOError(f"Permission denied accessing profile '{name}': {str(e)}") from e
@@ -4,6 +4,8 @@ Create Profile Dialog - Enhanced with manual fingerprint editing
 """
 import customtkinter as ctk
 import threading
+import tkinter.messagebox as mb
+from concurrent.futures import Future
 from typing import Optional, Callable
 
 from src.utils.fingerprint_generator import FingerprintGenerator
@@ -13,11 +15,16 @@ from src.utils.proxy_manager import ProxyConfig, ProxyTester
 class CreateProfileDialog(ctk.CTkToplevel):
     """Create profile dialog with manual fingerprint editing"""
     
+    # Interval for checking whether a background fingerprint is ready
+    POLL_INTERVAL_MS = 50
+    
     def __init__(self, parent, on_create: Callable):
         super().__init__(parent)
         
         self.on_create = on_create
         self.fingerprint = None
+        # (os_type, user agent) of the last auto user agent, reused on create
+        self._auto_ua = None
         
         self.title("Create New Profile")
         self.geometry("800x700")
@@ -61,7 +68,7 @@ class CreateProfileDialog(ctk.CTkToplevel):
         self.name_entry.pack(fill="x")
         
         # Tab view
-        self.tabview = ctk.CTkTabview(main_container)
+        self.tabview = ctk.CTkTabview(main_container, command=self._on_tab_changed)
         self.tabview.pack(fill="both", expand=True)
         
         # Add tabs
@@ -69,10 +76,12 @@ class CreateProfileDialog(ctk.CTkToplevel):
         self.tabview.add("Fingerprint")
         self.tabview.add("Proxy")
         
-        # Configure tabs
+        # Configure tabs; Fingerprint and Proxy are built the first time they are shown
         self._create_general_tab()
-        self._create_fingerprint_tab()
-        self._create_proxy_tab()
+        self._tab_builders = {
+            "Fingerprint": self._create_fingerprint_tab,
+            "Proxy": self._create_proxy_tab,
+        }
         
         # Buttons
         btn_frame = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -94,6 +103,16 @@ class CreateProfileDialog(ctk.CTkToplevel):
             height=40
         ).pack(side="right")
     
+    def _on_tab_changed(self):
+        """Build the selected tab on first selection"""
+        self._build_tab(self.tabview.get())
+    
+    def _build_tab(self, name: str):
+        """Create a tab's widgets unless they already exist"""
+        builder = self._tab_builders.pop(name, None)
+        if builder is not None:
+            builder()
+    
     def _create_general_tab(self):
         """Create General tab"""
         tab = self.tabview.tab("General")
@@ -164,13 +183,13 @@ class CreateProfileDialog(ctk.CTkToplevel):
         tab = self.tabview.tab("Fingerprint")
         
         # Generate button at top
-        generate_btn = ctk.CTkButton(
+        self.generate_btn = ctk.CTkButton(
             tab,
             text="🔄 Generate Random Fingerprint",
             command=self._generate_fingerprint,
             height=35
         )
-        generate_btn.pack(pady=(0, 15))
+        self.generate_btn.pack(pady=(0, 15))
         
         # Scrollable frame for fingerprint fields
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -331,9 +350,37 @@ class CreateProfileDialog(ctk.CTkToplevel):
             self.custom_ua_entry.configure(state="normal")
     
     def _generate_fingerprint(self):
-        """Generate random fingerprint and fill fields"""
+        """Generate random fingerprint in the background and fill fields"""
         os_type = self.os_var.get()
-        fp = FingerprintGenerator.generate(os_type)
+        self.generate_btn.configure(state="disabled")
+        
+        # The worker only resolves the future; Tk is touched from the main thread alone
+        future = Future()
+        
+        def generate_thread():
+            try:
+                future.set_result(FingerprintGenerator.generate(os_type))
+            except Exception as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=generate_thread, daemon=True).start()
+        self.after(self.POLL_INTERVAL_MS, self._poll_fingerprint, future, os_type)
+    
+    def _poll_fingerprint(self, future: Future, os_type: str):
+        """Apply the background fingerprint once ready, unless the dialog was closed"""
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(self.POLL_INTERVAL_MS, self._poll_fingerprint, future, os_type)
+            return
+        try:
+            self._apply_fingerprint(future.result(), os_type)
+        finally:
+            self.generate_btn.configure(state="normal")
+    
+    def _apply_fingerprint(self, fp, os_type: str):
+        """Fill fingerprint fields from a generated fingerprint"""
+        self._auto_ua = (os_type, fp.user_agent)
         
         # Fill fields
         self.screen_width.delete(0, 'end')
@@ -356,6 +403,12 @@ class CreateProfileDialog(ctk.CTkToplevel):
             self.custom_ua_entry.delete(0, 'end')
             self.custom_ua_entry.insert(0, fp.user_agent)
     
+    def _auto_user_agent(self, os_type: str) -> str:
+        """User agent of the last generated fingerprint for os_type, else a new one"""
+        if self._auto_ua is None or self._auto_ua[0] != os_type:
+            self._auto_ua = (os_type, FingerprintGenerator.generate_user_agent(os_type))
+        return self._auto_ua[1]
+    
     def _test_proxy(self):
         """Test proxy connection"""
         server = self.proxy_server.get().strip()
@@ -392,13 +445,29 @@ class CreateProfileDialog(ctk.CTkToplevel):
         
         threading.Thread(target=test_thread, daemon=True).start()
     
+    def _field(self, attr: str, default: str = "") -> str:
+        """Value of a lazily built widget, or the value it starts with if its tab was never opened"""
+        widget = getattr(self, attr, None)
+        return widget.get() if widget is not None else default
+    
+    def _show_status(self, text: str, color: str):
+        """Show a status message on the Proxy tab label, or in a message box if it was never built"""
+        if hasattr(self, "test_status"):
+            self.test_status.configure(text=text, text_color=color)
+        else:
+            mb.showwarning("Create Profile", text, parent=self)
+    
     def _create_profile(self):
         """Create the profile"""
         name = self.name_entry.get().strip()
         if not name:
-            self.test_status.configure(text="Enter profile name", text_color="orange")
+            self._show_status("Enter profile name", "orange")
             return
         
+        # Each widget is read once; every get() is a round trip into Tcl
+        os_type = self.os_var.get()
+        language = self._field("language", "en-US")
+        
         # Get user agent
         custom_ua = None
         if self.ua_var.get() == "custom":
@@ -408,36 +477,38 @@ class CreateProfileDialog(ctk.CTkToplevel):
         try:
             from src.utils.fingerprint_generator import BrowserFingerprint
             
+            screen_width = int(self._field("screen_width") or 1920)
+            screen_height = int(self._field("screen_height") or 1080)
             fingerprint = BrowserFingerprint(
-                user_agent=custom_ua or FingerprintGenerator.generate_user_agent(self.os_var.get()),
-                platform=self.platform.get(),
+                user_agent=custom_ua or self._auto_user_agent(os_type),
+                platform=self._field("platform", "Win32"),
                 vendor="Google Inc.",
                 renderer="Google Inc. (NVIDIA)",
-                language=self.language.get(),
-                languages=[self.language.get(), self.language.get()[:2]],
-                screen_width=int(self.screen_width.get() or 1920),
-                screen_height=int(self.screen_height.get() or 1080),
-                viewport_width=int(self.screen_width.get() or 1920) - 10,
-                viewport_height=int(self.screen_height.get() or 1080) - 100,
-                hardware_concurrency=int(self.cpu_cores.get()),
-                device_memory=int(self.memory.get()),
+                language=language,
+                languages=[language, language[:2]],
+                screen_width=screen_width,
+                screen_height=screen_height,
+                viewport_width=screen_width - 10,
+                viewport_height=screen_height - 100,
+                hardware_concurrency=int(self._field("cpu_cores", "2")),
+                device_memory=int(self._field("memory", "2")),
                 color_depth=24,
                 timezone="Europe/Kiev",
-                webgl_vendor=self.webgl_vendor.get() or "Google Inc. (NVIDIA)",
-                webgl_renderer=self.webgl_renderer.get() or "ANGLE (NVIDIA GeForce GTX 1660 Ti)"
+                webgl_vendor=self._field("webgl_vendor") or "Google Inc. (NVIDIA)",
+                webgl_renderer=self._field("webgl_renderer") or "ANGLE (NVIDIA GeForce GTX 1660 Ti)"
             )
         except ValueError as e:
-            self.test_status.configure(text=f"Invalid fingerprint: {e}", text_color="red")
+            self._show_status(f"Invalid fingerprint: {e}", "red")
             return
         
         # Get proxy
         proxy = None
-        server = self.proxy_server.get().strip()
+        server = self._field("proxy_server").strip()
         if server:
             proxy = ProxyConfig(
                 server=server,
-                username=self.proxy_user.get().strip() or None,
-                password=self.proxy_pass.get().strip() or None
+                username=self._field("proxy_user").strip() or None,
+                password=self._field("proxy_pass").strip() or None
             )
         
         # Get notes
@@ -447,7 +518,7 @@ class CreateProfileDialog(ctk.CTkToplevel):
         # For now, we'll create a custom version
         result = {
             'name': name,
-            'os_type': self.os_var.get(),
+            'os_type': os_type,
             'custom_user_agent': custom_ua,
             'fingerprint': fingerprint,
             'proxy': proxy,
@@ -461,4 +532,4 @@ class CreateProfileDialog(ctk.CTkToplevel):
             self.on_create({'name': name})
             self.destroy()
         else:
-            self.test_status.configure(text="Failed to create profile", text_color="red")
\ No newline at end of file
+            self._show_status("Failed to create profile", "red")
\ No newline at end of file
@@ -4,6 +4,8 @@ Edit Profile Dialog - Enhanced with manual editing
 """
 import customtkinter as ctk
 import threading
+import tkinter.messagebox as mb
+from concurrent.futures import Future
 from typing import Optional, Callable
 
 from src.utils.fingerprint_generator import FingerprintGenerator, BrowserFingerprint
@@ -13,11 +15,15 @@ from src.utils.proxy_manager import ProxyConfig, ProxyTester
 class EditProfileDialog(ctk.CTkToplevel):
     """Edit profile dialog with manual fingerprint editing"""
     
+    # Interval for checking whether a background fingerprint is ready
+    POLL_INTERVAL_MS = 50
+    
     def __init__(self, parent, profile, on_save: Callable):
         super().__init__(parent)
         
         self.profile = profile
         self.on_save = on_save
+        self._test_gen = 0  # Only the latest proxy test may update the UI
         
         self.title(f"Edit Profile: {profile.name}")
         self.geometry("800x700")
@@ -49,7 +55,7 @@ class EditProfileDialog(ctk.CTkToplevel):
         ).pack(pady=(0, 20))
         
         # Tab view
-        self.tabview = ctk.CTkTabview(main_container)
+        self.tabview = ctk.CTkTabview(main_container, command=self._on_tab_changed)
         self.tabview.pack(fill="both", expand=True)
         
         # Add tabs
@@ -58,11 +64,14 @@ class EditProfileDialog(ctk.CTkToplevel):
         self.tabview.add("Engine")
         self.tabview.add("Notes")
         
-        # Configure tabs
+        # Configure tabs; only Fingerprint (shown first) is built up front,
+        # the others the first time they are selected
         self._create_fingerprint_tab()
-        self._create_proxy_tab()
-        self._create_engine_tab()
-        self._create_notes_tab()
+        self._tab_builders = {
+            "Proxy": self._create_proxy_tab,
+            "Engine": self._create_engine_tab,
+            "Notes": self._create_notes_tab,
+        }
         
         # Buttons
         btn_frame = ctk.CTkFrame(main_container, fg_color="transparent")
@@ -84,18 +93,28 @@ class EditProfileDialog(ctk.CTkToplevel):
             height=40
         ).pack(side="right")
     
+    def _on_tab_changed(self):
+        """Build the selected tab on first selection"""
+        self._build_tab(self.tabview.get())
+    
+    def _build_tab(self, name: str):
+        """Create a tab's widgets unless they already exist"""
+        builder = self._tab_builders.pop(name, None)
+        if builder is not None:
+            builder()
+    
     def _create_fingerprint_tab(self):
         """Create Fingerprint tab with manual editing"""
         tab = self.tabview.tab("Fingerprint")
         
         # Generate button at top
-        generate_btn = ctk.CTkButton(
+        self.generate_btn = ctk.CTkButton(
             tab,
             text="🔄 Generate New Fingerprint",
             command=self._generate_fingerprint,
             height=35
         )
-        generate_btn.pack(pady=(0, 15))
+        self.generate_btn.pack(pady=(0, 15))
         
         # Scrollable frame for fingerprint fields
         scroll_frame = ctk.CTkScrollableFrame(tab)
@@ -114,103 +133,49 @@ class EditProfileDialog(ctk.CTkToplevel):
         self.ua_entry = ctk.CTkEntry(ua_frame)
         self.ua_entry.pack(fill="x", padx=10, pady=(0, 10))
         
-        # Screen settings
-        screen_frame = ctk.CTkFrame(scroll_frame, fg_color="#2a2d2e", corner_radius=6)
-        screen_frame.pack(fill="x", pady=(0, 10))
-        
-        ctk.CTkLabel(
-            screen_frame,
-            text="Screen Settings",
-            font=ctk.CTkFont(weight="bold")
-        ).pack(anchor="w", padx=10, pady=(10, 5))
-        
-        # Screen width
-        width_frame = ctk.CTkFrame(screen_frame, fg_color="transparent")
-        width_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(width_frame, text="Width:", width=100).pack(side="left")
-        self.screen_width = ctk.CTkEntry(width_frame)
-        self.screen_width.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # Screen height
-        height_frame = ctk.CTkFrame(screen_frame, fg_color="transparent")
-        height_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(height_frame, text="Height:", width=100).pack(side="left")
-        self.screen_height = ctk.CTkEntry(height_frame)
-        self.screen_height.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # Hardware settings
-        hardware_frame = ctk.CTkFrame(scroll_frame, fg_color="#2a2d2e", corner_radius=6)
-        hardware_frame.pack(fill="x", pady=(0, 10))
-        
-        ctk.CTkLabel(
-            hardware_frame,
-            text="Hardware Settings",
-            font=ctk.CTkFont(weight="bold")
-        ).pack(anchor="w", padx=10, pady=(10, 5))
-        
-        # CPU cores
-        cores_frame = ctk.CTkFrame(hardware_frame, fg_color="transparent")
-        cores_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(cores_frame, text="CPU Cores:", width=100).pack(side="left")
-        self.cpu_cores = ctk.CTkOptionMenu(cores_frame, values=["2", "4", "8", "12", "16"])
-        self.cpu_cores.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # Memory
-        memory_frame = ctk.CTkFrame(hardware_frame, fg_color="transparent")
-        memory_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(memory_frame, text="Memory (GB):", width=100).pack(side="left")
-        self.memory = ctk.CTkOptionMenu(memory_frame, values=["2", "4", "8", "16", "32"])
-        self.memory.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # Platform settings
-        platform_frame = ctk.CTkFrame(scroll_frame, fg_color="#2a2d2e", corner_radius=6)
-        platform_frame.pack(fill="x", pady=(0, 10))
-        
-        ctk.CTkLabel(
-            platform_frame,
-            text="Platform Settings",
-            font=ctk.CTkFont(weight="bold")
-        ).pack(anchor="w", padx=10, pady=(10, 5))
-        
-        # Platform
-        platform_type_frame = ctk.CTkFrame(platform_frame, fg_color="transparent")
-        platform_type_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(platform_type_frame, text="Platform:", width=100).pack(side="left")
-        self.platform = ctk.CTkOptionMenu(platform_type_frame, 
-                                         values=["Win32", "MacIntel", "Linux x86_64"])
-        self.platform.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # Language
-        language_frame = ctk.CTkFrame(platform_frame, fg_color="transparent")
-        language_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(language_frame, text="Language:", width=100).pack(side="left")
-        self.language = ctk.CTkOptionMenu(language_frame, 
-                                         values=["en-US", "ru-RU", "de-DE", "fr-FR", "es-ES"])
-        self.language.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # WebGL settings
-        webgl_frame = ctk.CTkFrame(scroll_frame, fg_color="#2a2d2e", corner_radius=6)
-        webgl_frame.pack(fill="x", pady=(0, 10))
+        # Labelled settings sections
+        entry = ctk.CTkEntry
+        
+        def options(*values):
+            return lambda parent: ctk.CTkOptionMenu(parent, values=list(values))
+        
+        self._create_section(scroll_frame, "Screen Settings", (
+            ("Width:", "screen_width", entry),
+            ("Height:", "screen_height", entry),
+        ))
+        self._create_section(scroll_frame, "Hardware Settings", (
+            ("CPU Cores:", "cpu_cores", options("2", "4", "8", "12", "16")),
+            ("Memory (GB):", "memory", options("2", "4", "8", "16", "32")),
+        ))
+        self._create_section(scroll_frame, "Platform Settings", (
+            ("Platform:", "platform", options("Win32", "MacIntel", "Linux x86_64")),
+            ("Language:", "language", options("en-US", "ru-RU", "de-DE", "fr-FR", "es-ES")),
+        ))
+        self._create_section(scroll_frame, "WebGL Settings", (
+            ("Vendor:", "webgl_vendor", entry),
+            ("Renderer:", "webgl_renderer", entry),
+        ))
+    
+    def _create_section(self, parent, title: str, fields):
+        """Create a titled section with one label/input row per (label, attr, factory)"""
+        section = ctk.CTkFrame(parent, fg_color="#2a2d2e", corner_radius=6)
+        section.pack(fill="x", pady=(0, 10))
+        # Fixed label column (100px label + 10px left pad), inputs take the rest
+        section.grid_columnconfigure(0, minsize=110)
+        section.grid_columnconfigure(1, weight=1)
         
         ctk.CTkLabel(
-            webgl_frame,
-            text="WebGL Settings",
+            section,
+            text=title,
             font=ctk.CTkFont(weight="bold")
-        ).pack(anchor="w", padx=10, pady=(10, 5))
-        
-        # WebGL vendor
-        vendor_frame = ctk.CTkFrame(webgl_frame, fg_color="transparent")
-        vendor_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(vendor_frame, text="Vendor:", width=100).pack(side="left")
-        self.webgl_vendor = ctk.CTkEntry(vendor_frame)
-        self.webgl_vendor.pack(side="left", fill="x", expand=True, padx=(10, 0))
-        
-        # WebGL renderer
-        renderer_frame = ctk.CTkFrame(webgl_frame, fg_color="transparent")
-        renderer_frame.pack(fill="x", padx=10, pady=2)
-        ctk.CTkLabel(renderer_frame, text="Renderer:", width=100).pack(side="left")
-        self.webgl_renderer = ctk.CTkEntry(renderer_frame)
-        self.webgl_renderer.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        ).grid(row=0, column=0, columnspan=2, sticky="w", padx=10, pady=(10, 5))
+        
+        for row, (label, attr, factory) in enumerate(fields, start=1):
+            ctk.CTkLabel(section, text=label).grid(
+                row=row, column=0, padx=(10, 0), pady=2)
+            widget = factory(section)
+            widget.grid(row=row, column=1, sticky="ew", padx=10, pady=2)
+            setattr(self, attr, widget)
     
     def _create_proxy_tab(self):
         """Create Proxy tab"""
@@ -270,6 +235,8 @@ class EditProfileDialog(ctk.CTkToplevel):
         
         self.test_status = ctk.CTkLabel(tab, text="")
         self.test_status.pack(anchor="w", pady=(10, 0))
+        
+        self._load_proxy_settings()
     
     def _create_engine_tab(self):
         """Create Engine tab"""
@@ -318,44 +285,61 @@ class EditProfileDialog(ctk.CTkToplevel):
         
         self.notes_text = ctk.CTkTextbox(tab, height=400)
         self.notes_text.pack(fill="both", expand=True, pady=10)
+        
+        # Notes
+        if self.profile.notes:
+            self.notes_text.insert("1.0", self.profile.notes)
     
     def _load_current_settings(self):
-        """Load current profile settings"""
+        """Load current fingerprint settings; other tabs load theirs when built"""
         if self.profile.fingerprint:
-            fp = self.profile.fingerprint
-            
-            # User Agent
-            self.ua_entry.insert(0, fp.get('user_agent', ''))
-            
-            # Screen
-            self.screen_width.insert(0, str(fp.get('screen_width', '1920')))
-            self.screen_height.insert(0, str(fp.get('screen_height', '1080')))
-            
-            # Hardware
-            self.cpu_cores.set(str(fp.get('hardware_concurrency', '8')))
-            self.memory.set(str(fp.get('device_memory', '8')))
-            
-            # Platform
-            self.platform.set(fp.get('platform', 'Win32'))
-            self.language.set(fp.get('language', 'en-US'))
-            
-            # WebGL
-            self.webgl_vendor.insert(0, fp.get('webgl_vendor', 'Google Inc. (NVIDIA)'))
-            self.webgl_renderer.insert(0, fp.get('webgl_renderer', 'ANGLE (NVIDIA GeForce GTX 1660 Ti)'))
+            self._fill_fingerprint_fields(self.profile.fingerprint)
+    
+    @staticmethod
+    def _set_entry(entry, value: str):
+        """Replace an entry's text, skipping the update if it is unchanged"""
+        if entry.get() == value:
+            return
+        entry.delete(0, 'end')
+        entry.insert(0, value)
+    
+    @staticmethod
+    def _set_option(menu, value: str):
+        """Select an option menu value, skipping the update if it is unchanged"""
+        if menu.get() != value:
+            menu.set(value)
+    
+    def _fill_fingerprint_fields(self, fp: dict):
+        """Populate the Fingerprint tab from a fingerprint dict"""
+        # User Agent
+        self._set_entry(self.ua_entry, fp.get('user_agent', ''))
+        
+        # Screen
+        self._set_entry(self.screen_width, str(fp.get('screen_width', '1920')))
+        self._set_entry(self.screen_height, str(fp.get('screen_height', '1080')))
+        
+        # Hardware
+        self._set_option(self.cpu_cores, str(fp.get('hardware_concurrency', '8')))
+        self._set_option(self.memory, str(fp.get('device_memory', '8')))
         
-        # Proxy
+        # Platform
+        self._set_option(self.platform, fp.get('platform', 'Win32'))
+        self._set_option(self.language, fp.get('language', 'en-US'))
+        
+        # WebGL
+        self._set_entry(self.webgl_vendor, fp.get('webgl_vendor', 'Google Inc. (NVIDIA)'))
+        self._set_entry(self.webgl_renderer, fp.get('webgl_renderer', 'ANGLE (NVIDIA GeForce GTX 1660 Ti)'))
+    
+    def _load_proxy_settings(self):
+        """Load current proxy settings"""
         if self.profile.proxy:
             proxy = self.profile.proxy
             self.proxy_server.insert(0, proxy.get('server', ''))
             self.proxy_user.insert(0, proxy.get('username', ''))
             self.proxy_pass.insert(0, proxy.get('password', ''))
-        
-        # Notes
-        if self.profile.notes:
-            self.notes_text.insert("1.0", self.profile.notes)
     
     def _generate_fingerprint(self):
-        """Generate new fingerprint"""
+        """Generate new fingerprint in the background and fill fields"""
         # Detect OS from platform
         platform = self.platform.get().lower()
         if 'win' in platform:
@@ -367,32 +351,41 @@ class EditProfileDialog(ctk.CTkToplevel):
         
         # Generate with current user agent or new one
         current_ua = self.ua_entry.get().strip()
-        fp = FingerprintGenerator.generate(os_type, current_ua)
-        
-        # Update fields
-        self.ua_entry.delete(0, 'end')
-        self.ua_entry.insert(0, fp.user_agent)
+        self.generate_btn.configure(state="disabled")
         
-        self.screen_width.delete(0, 'end')
-        self.screen_width.insert(0, str(fp.screen_width))
+        # The worker only resolves the future; Tk is touched from the main thread alone
+        future = Future()
         
-        self.screen_height.delete(0, 'end')
-        self.screen_height.insert(0, str(fp.screen_height))
+        def generate_thread():
+            try:
+                future.set_result(FingerprintGenerator.generate(os_type, current_ua))
+            except Exception as e:
+                future.set_exception(e)
         
-        self.cpu_cores.set(str(fp.hardware_concurrency))
-        self.memory.set(str(fp.device_memory))
-        
-        self.platform.set(fp.platform)
-        self.language.set(fp.language)
-        
-        self.webgl_vendor.delete(0, 'end')
-        self.webgl_vendor.insert(0, fp.webgl_vendor)
-        
-        self.webgl_renderer.delete(0, 'end')
-        self.webgl_renderer.insert(0, fp.webgl_renderer)
+        threading.Thread(target=generate_thread, daemon=True).start()
+        self.after(self.POLL_INTERVAL_MS, self._poll_fingerprint, future)
+    
+    def _poll_fingerprint(self, future: Future):
+        """Apply the background fingerprint once ready, unless the dialog was closed"""
+        if not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(self.POLL_INTERVAL_MS, self._poll_fingerprint, future)
+            return
+        try:
+            self._apply_fingerprint(future.result())
+        finally:
+            self.generate_btn.configure(state="normal")
+    
+    def _apply_fingerprint(self, fp: BrowserFingerprint):
+        """Fill fingerprint fields from a generated fingerprint"""
+        self._fill_fingerprint_fields(fp.to_dict())
     
     def _test_proxy(self):
         """Test proxy connection"""
+        if self.test_btn.cget("state") == "disabled":
+            return
+        
         server = self.proxy_server.get().strip()
         if not server:
             self.test_status.configure(text="Enter proxy server", text_color="orange")
@@ -404,6 +397,7 @@ class EditProfileDialog(ctk.CTkToplevel):
             password=self.proxy_pass.get().strip() or None
         )
         
+        gen = self._test_gen = self._test_gen + 1
         self.test_btn.configure(state="disabled")
         self.test_status.configure(text="Testing...", text_color="gray")
         
@@ -411,6 +405,9 @@ class EditProfileDialog(ctk.CTkToplevel):
             result = ProxyTester.test_proxy(proxy)
             
             def update_ui():
+                # Dialog closed or a newer test superseded this one
+                if gen != self._test_gen or not self.winfo_exists():
+                    return
                 if result["success"]:
                     self.test_status.configure(
                         text=f"✓ Connected ({result['latency']}ms)",
@@ -429,26 +426,38 @@ class EditProfileDialog(ctk.CTkToplevel):
     
     def _clear_proxy(self):
         """Clear proxy settings"""
+        self._test_gen += 1
+        self.test_btn.configure(state="normal")
         self.proxy_server.delete(0, 'end')
         self.proxy_user.delete(0, 'end')
         self.proxy_pass.delete(0, 'end')
         self.test_status.configure(text="")
     
+    def _show_status(self, text: str, color: str):
+        """Show a status message on the Proxy tab label, or in a message box if it was never built"""
+        if hasattr(self, "test_status"):
+            self.test_status.configure(text=text, text_color=color)
+        else:
+            mb.showwarning("Edit Profile", text, parent=self)
+    
     def _save(self):
-        """Save changes"""
+        """Save changes; tabs that were never opened keep the stored profile values"""
         try:
             # Build fingerprint from manual settings
+            language = self.language.get()
+            screen_width = int(self.screen_width.get() or 1920)
+            screen_height = int(self.screen_height.get() or 1080)
             fingerprint = BrowserFingerprint(
                 user_agent=self.ua_entry.get().strip(),
                 platform=self.platform.get(),
                 vendor="Google Inc.",
                 renderer="Google Inc. (NVIDIA)",
-                language=self.language.get(),
-                languages=[self.language.get(), self.language.get()[:2]],
-                screen_width=int(self.screen_width.get() or 1920),
-                screen_height=int(self.screen_height.get() or 1080),
-                viewport_width=int(self.screen_width.get() or 1920) - 10,
-                viewport_height=int(self.screen_height.get() or 1080) - 100,
+                language=language,
+                languages=[language, language[:2]],
+                screen_width=screen_width,
+                screen_height=screen_height,
+                viewport_width=screen_width - 10,
+                viewport_height=screen_height - 100,
                 hardware_concurrency=int(self.cpu_cores.get()),
                 device_memory=int(self.memory.get()),
                 color_depth=24,
@@ -457,24 +466,33 @@ class EditProfileDialog(ctk.CTkToplevel):
                 webgl_renderer=self.webgl_renderer.get()
             )
         except ValueError as e:
-            self.test_status.configure(text=f"Invalid fingerprint: {e}", text_color="red")
+            self._show_status(f"Invalid fingerprint: {e}", "red")
             return
         
         # Get proxy
         proxy = None
-        server = self.proxy_server.get().strip()
-        if server:
-            proxy = ProxyConfig(
-                server=server,
-                username=self.proxy_user.get().strip() or None,
-                password=self.proxy_pass.get().strip() or None
-            )
+        if hasattr(self, "proxy_server"):
+            server = self.proxy_server.get().strip()
+            if server:
+                proxy = ProxyConfig(
+                    server=server,
+                    username=self.proxy_user.get().strip() or None,
+                    password=self.proxy_pass.get().strip() or None
+                )
+        elif self.profile.proxy:
+            proxy = ProxyConfig.from_dict(self.profile.proxy)
         
         # Get notes
-        notes = self.notes_text.get("1.0", "end-1c").strip()
+        if hasattr(self, "notes_text"):
+            notes = self.notes_text.get("1.0", "end-1c").strip()
+        else:
+            notes = self.profile.notes or ""
         
         # Get engine
-        engine = self.engine_var.get()
+        if hasattr(self, "engine_var"):
+            engine = self.engine_var.get()
+        else:
+            engine = getattr(self.profile, 'engine', 'chromedriver')
         
         # Save
         # We need to modify profile_manager to accept engine parameter
@@ -490,4 +508,4 @@ class EditProfileDialog(ctk.CTkToplevel):
             self.on_save(fingerprint, proxy, notes)
             self.destroy()
         else:
-            self.test_status.configure(text="Failed to save profile", text_color="red")
+            self._show_status("Failed to save profile", "red")
@@ -6,6 +6,7 @@ import sys
 import os
 import subprocess
 import threading
+import time
 import customtkinter as ctk
 import tkinter as tk
 from typing import Optional, Dict, List
@@ -24,12 +25,23 @@ ctk.set_default_color_theme("blue")
 class ProfileManagerGUI(ctk.CTk):
     """Main application window - Fixed layout"""
     
+    # Delay after the last search keystroke before the list is rebuilt (ms)
+    SEARCH_DEBOUNCE_MS = 250
+    # Hidden profile rows kept for reuse instead of being destroyed
+    ROW_POOL_SIZE = 64
+    # How long the running-profile set from the last refresh stays trusted (s)
+    RUNNING_SNAPSHOT_TTL = 1.0
+    
     def __init__(self, profile_manager: ProfileManager):
         super().__init__()
         
         self.profile_manager = profile_manager
         self.selected_profile = None
-        self.profile_buttons = {}
+        self.profile_buttons = {}  # name -> row widgets and the state they show
+        self._row_order = []
+        self._row_pool = []
+        self._running_snapshot = (0.0, set())  # (monotonic time, running names)
+        self._search_after_id = None
         self.current_tab = "profiles"  # profiles, settings
         self.process_monitor_service = ProcessMonitorService()
         
@@ -59,7 +71,7 @@ class ProfileManagerGUI(ctk.CTk):
             return False
             
     def _safe_destroy_children(self, parent_widget):
-        """Safely destroy all children of a widget, handling pending events"""
+        """Safely destroy all children of a widget, unbinding their events first"""
         try:
             # Get all children first to avoid modification during iteration
             children = list(parent_widget.winfo_children())
@@ -69,8 +81,7 @@ class ProfileManagerGUI(ctk.CTk):
                     widget.unbind("<Button-1>")
                     widget.unbind("<Button-3>")
                     
-                    # Schedule destruction after all pending events are processed
-                    self.after_idle(widget.destroy)
+                    widget.destroy()
                 except Exception:
                     # Widget may have already been destroyed
                     pass
@@ -179,7 +190,7 @@ class ProfileManagerGUI(ctk.CTk):
             textvariable=self.search_var
         )
         self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        self.search_var.trace_add("write", lambda *args: self._refresh_profile_list())
+        self.search_var.trace_add("write", lambda *args: self._schedule_refresh())
         
         # Create profile button
         create_btn = ctk.CTkButton(
@@ -257,8 +268,25 @@ class ProfileManagerGUI(ctk.CTk):
             # Expand main content when in settings
             self.main_container.grid_configure(columnspan=2)
     
-    def _create_profile_row(self, profile_name: str, profile_data):
-        """Create a profile row in the list"""
+    def _create_profile_row(self, profile_name: str, profile_data, is_running: Optional[bool] = None):
+        """Create a profile row in the list, reusing a pooled row if there is one"""
+        if self._row_pool:
+            row = self._row_pool.pop()
+            row["frame"].pack(fill="x", pady=6)
+            row["running"] = row["details"] = None
+        else:
+            row = self._build_profile_row()
+        
+        # Event handlers look the name up on the row, so a reused row needs no rebinding
+        row["name"] = profile_name
+        row["name_lbl"].configure(text=profile_name)
+        
+        # Store reference
+        self.profile_buttons[profile_name] = row
+        self._update_profile_row(profile_name, profile_data, is_running)
+    
+    def _build_profile_row(self) -> dict:
+        """Create the widgets of an empty profile row"""
         row = ctk.CTkFrame(
             self.profile_list_container,
             fg_color="#2a2d2e",
@@ -270,9 +298,6 @@ class ProfileManagerGUI(ctk.CTk):
         row.grid_propagate(False)
         row.configure(height=60)
         
-        # Store reference
-        self.profile_buttons[profile_name] = row
-        
         # Используем grid для точного контроля
         row.grid_columnconfigure(0, weight=1)  # левая часть (информация)
         row.grid_columnconfigure(1, weight=0)  # правая часть (кнопка)
@@ -292,21 +317,17 @@ class ProfileManagerGUI(ctk.CTk):
         # Profile name
         name_label = ctk.CTkLabel(
             info_frame,
-            text=profile_name,
+            text="",
             font=ctk.CTkFont(size=18, weight="bold"),  # еще уменьшили
             anchor="w",
             height=12  # задаем высоту
         )
         name_label.grid(row=0, column=0, sticky="w", padx=0, pady=(1, 0))
         
-        # Engine and last launch time
-        engine = getattr(profile_data, 'engine', 'chromedriver')
-        last_launched = getattr(profile_data, 'last_launched', '')
-        last_time = last_launched[:10] if last_launched else 'Never'  # показываем только дату
-        
+        # Engine and last launch time (filled in by _update_profile_row)
         details_label = ctk.CTkLabel(
             info_frame,
-            text=f"{engine} • {last_time}",
+            text="",
             font=ctk.CTkFont(size=9),  # еще уменьшили
             text_color="gray",
             anchor="w",
@@ -314,42 +335,92 @@ class ProfileManagerGUI(ctk.CTk):
         )
         details_label.grid(row=1, column=0, sticky="w", padx=0, pady=(0, 1))
         
-        # Right side: Start/Stop button
-        is_running = BrowserLauncher.is_running(profile_name)
+        # Right side: Start/Stop button (styled by _update_profile_row)
+        action_btn = ctk.CTkButton(row, text="", width=100, height=35)
+        action_btn.grid(row=0, column=1, sticky="ns", padx=(0, 8), pady=17)
+        
+        widgets = {
+            "name": None,
+            "frame": row,
+            "name_lbl": name_label,
+            "details_lbl": details_label,
+            "action_btn": action_btn,
+            "running": None,
+            "details": None,
+        }
+        
+        # Bind click to select profile (ignore clicks originating from action button)
+        row.bind("<Button-1>", lambda e: self._on_profile_row_click(e, widgets["name"]))
+        info_frame.bind("<Button-1>", lambda e: self._on_profile_row_click(e, widgets["name"]))
+        name_label.bind("<Button-1>", lambda e: self._on_profile_row_click(e, widgets["name"]))
+        details_label.bind("<Button-1>", lambda e: self._on_profile_row_click(e, widgets["name"]))
+        
+        # Context menu
+        row.bind("<Button-3>", lambda e: self._show_context_menu(e, widgets["name"]))
+        
+        return widgets
+    
+    def _update_profile_row(self, profile_name: str, profile_data, is_running: Optional[bool] = None):
+        """Bring an existing row up to date, touching only widgets whose state changed"""
+        row = self.profile_buttons[profile_name]
+        
+        # Engine and last launch time
+        engine = getattr(profile_data, 'engine', 'chromedriver')
+        last_launched = getattr(profile_data, 'last_launched', '')
+        last_time = last_launched[:10] if last_launched else 'Never'  # показываем только дату
+        details = f"{engine} • {last_time}"
+        if details != row["details"]:
+            row["details_lbl"].configure(text=details)
+            row["details"] = details
+        
+        if is_running is None:
+            is_running = BrowserLauncher.is_running(profile_name)
+        if is_running == row["running"]:
+            return
+        row["running"] = is_running
         
         if is_running:
             # Stop button (red)
-            action_btn = ctk.CTkButton(
-                row,
+            row["action_btn"].configure(
                 text="⏹️ Stop",
-                width=100,
-                height=35,
                 fg_color="#dc3545",
                 hover_color="#c82333",
                 command=lambda n=profile_name: self.stop_profile(n)
             )
         else:
             # Start button (green)
-            action_btn = ctk.CTkButton(
-                row,
+            row["action_btn"].configure(
                 text="▶ Start",
-                width=100,
-                height=35,
                 fg_color="#28a745",
                 hover_color="#218838",
                 command=lambda n=profile_name: self.start_profile(n)
             )
-        
-        action_btn.grid(row=0, column=1, sticky="ns", padx=(0, 8), pady=17)
-        
-        # Bind click to select profile (ignore clicks originating from action button)
-        row.bind("<Button-1>", lambda e, n=profile_name: self._on_profile_row_click(e, n))
-        info_frame.bind("<Button-1>", lambda e, n=profile_name: self._on_profile_row_click(e, n))
-        name_label.bind("<Button-1>", lambda e, n=profile_name: self._on_profile_row_click(e, n))
-        details_label.bind("<Button-1>", lambda e, n=profile_name: self._on_profile_row_click(e, n))
-        
-        # Context menu
-        row.bind("<Button-3>", lambda e, n=profile_name: self._show_context_menu(e, n))
+    
+    def _remove_profile_row(self, profile_name: str):
+        """Remove a row that is no longer listed, keeping it for reuse if the pool has room"""
+        row = self.profile_buttons.pop(profile_name)
+        frame = row["frame"]
+        try:
+            frame.pack_forget()
+            if len(self._row_pool) < self.ROW_POOL_SIZE:
+                self._row_pool.append(row)
+                return
+            frame.unbind("<Button-1>")
+            frame.unbind("<Button-3>")
+            frame.destroy()
+        except Exception:
+            # Widget may have already been destroyed
+            pass
+    
+    def _schedule_refresh(self):
+        """Refresh the profile list once typing in the search box pauses"""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DEBOUNCE_MS, self._run_scheduled_refresh)
+    
+    def _run_scheduled_refresh(self):
+        self._search_after_id = None
+        self._refresh_profile_list()
     
     def _refresh_profile_list(self):
         """Refresh the profile list with search filtering"""
@@ -357,9 +428,6 @@ class ProfileManagerGUI(ctk.CTk):
         if not self._is_ui_valid():
             return
             
-        # Clear current list with proper cleanup
-        self._safe_destroy_children(self.profile_list_container)
-        
         # Get all profiles
         try:
             profiles = self.profile_manager.list_profiles()
@@ -367,6 +435,18 @@ class ProfileManagerGUI(ctk.CTk):
             # Handle case where profile manager is not available
             return
         
+        # Take one process snapshot for all the is_running checks below
+        BrowserLauncher.prime_process_scan()
+        try:
+            states = self.profile_manager.get_all_instance_states()
+        except Exception:
+            states = {}
+        else:
+            self._running_snapshot = (
+                time.monotonic(),
+                {name for name, state in states.items() if state['is_running']}
+            )
+        
         # Apply search filter
         try:
             search_term = self.search_var.get().strip().lower()
@@ -389,16 +469,44 @@ class ProfileManagerGUI(ctk.CTk):
         # Sort by name
         filtered_profiles.sort(key=lambda x: x[0])
         
-        # Create profile rows
+        # Drop rows that are no longer listed; existing rows are updated in place
+        listed = {name for name, _ in filtered_profiles}
+        for name in [n for n in self.profile_buttons if n not in listed]:
+            self._remove_profile_row(name)
+        
+        order = []
         for name, profile in filtered_profiles:
             # Check if UI is still valid before creating widgets
             if not self._is_ui_valid():
                 return
             try:
-                self._create_profile_row(name, profile)
+                state = states.get(name)
+                is_running = state['is_running'] if state else None
+                if name in self.profile_buttons:
+                    self._update_profile_row(name, profile, is_running)
+                else:
+                    self._create_profile_row(name, profile, is_running)
+                order.append(name)
             except Exception:
                 # Skip profile if we can't create its row
-                pass
+                if name in self.profile_buttons:
+                    self._remove_profile_row(name)
+        
+        # New rows are packed at the end; repack only if that broke the sort order
+        packed = [n for n in self._row_order if n in self.profile_buttons] + [n for n in order if n not in self._row_order]
+        if packed != order:
+            for name in order:
+                self.profile_buttons[name]["frame"].pack_forget()
+            for name in order:
+                self.profile_buttons[name]["frame"].pack(fill="x", pady=6)
+        self._row_order = order
+    
+    def _is_profile_running(self, profile_name: str) -> bool:
+        """Check a profile against the last refresh's snapshot, or directly if it is stale"""
+        taken_at, running = self._running_snapshot
+        if time.monotonic() - taken_at < self.RUNNING_SNAPSHOT_TTL:
+            return profile_name in running
+        return BrowserLauncher.is_running(profile_name)
     
     def select_profile(self, profile_name: str):
         """Select a profile"""
@@ -475,7 +583,7 @@ class ProfileManagerGUI(ctk.CTk):
             ).pack(side="left", padx=10)
             
             # Status
-            is_running = BrowserLauncher.is_running(self.selected_profile)
+            is_running = self._is_profile_running(self.selected_profile)
             status_text = "🟢 Running" if is_running else "⚫ Stopped"
             status_color = "green" if is_running else "gray"
             
@@ -945,7 +1053,8 @@ class ProfileManagerGUI(ctk.CTk):
                               f"Delete profile '{profile_name}' and all its data?\n\nThis cannot be undone."):
                 return
             
-            success = self.profile_manager.delete_profile(profile_name)
+            # Files are removed in the background so the window stays responsive
+            success = self.profile_manager.delete_profile(profile_name, wait=False)
             if success:
                 if self.selected_profile == profile_name:
                     self.selected_profile = None
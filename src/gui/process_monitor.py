@@ -69,7 +69,7 @@ class ProcessMonitorWindow(ctk.CTkToplevel):
             widget.destroy()
         
         # Get all instances from BrowserLauncher
-        instances = BrowserLauncher.get_active_processes()
+        instances = BrowserLauncher.snapshot()
         running_instances = {name: process for name, process in instances.items() if process.is_alive()}
         
         if not running_instances:
@@ -2,8 +2,11 @@
 Cache cleaning utility to reduce profile size
 """
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, List
+
+from src.utils.dir_size import dir_size
 
 
 class CacheCleaner:
@@ -40,8 +43,13 @@ class CacheCleaner:
         'QuotaManager-journal',
     ]
     
+    # Default number of threads walking cache directories; the walks are
+    # stat()/unlink()-bound and release the GIL
+    WORKERS = 8
+    
     @staticmethod
-    def clean_profile_cache(profile_dir: Path, keep_cookies: bool = True, keep_history: bool = True) -> int:
+    def clean_profile_cache(profile_dir: Path, keep_cookies: bool = True, keep_history: bool = True,
+                            workers: int = WORKERS) -> int:
         """
         Clean cache from profile directory
         
@@ -49,6 +57,7 @@ class CacheCleaner:
             profile_dir: Path to profile directory
             keep_cookies: If True, preserves cookies
             keep_history: If True, preserves browsing history
+            workers: Threads used to measure and remove cache directories
             
         Returns:
             Number of bytes freed
@@ -66,18 +75,14 @@ class CacheCleaner:
         if default_profile.exists():
             search_locations.append(default_profile)
         
+        # Clean cache directories
+        bytes_freed += sum(CacheCleaner._map_dirs(
+            CacheCleaner._remove_dir,
+            CacheCleaner._existing_cache_dirs(search_locations),
+            workers
+        ))
+        
         for search_dir in search_locations:
-            # Clean cache directories
-            for cache_dir_name in CacheCleaner.CACHE_DIRS:
-                cache_path = search_dir / cache_dir_name
-                if cache_path.exists():
-                    try:
-                        size = CacheCleaner._get_dir_size(cache_path)
-                        shutil.rmtree(cache_path, ignore_errors=True)
-                        bytes_freed += size
-                    except Exception as e:
-                        print(f"Error cleaning {cache_dir_name}: {e}")
-            
             # Clean cache files (with optional preservation)
             files_to_clean = []
             for cache_file in CacheCleaner.CACHE_FILES:
@@ -91,13 +96,14 @@ class CacheCleaner:
             
             for cache_file_name in files_to_clean:
                 cache_file = search_dir / cache_file_name
-                if cache_file.exists():
-                    try:
-                        size = cache_file.stat().st_size
-                        cache_file.unlink()
-                        bytes_freed += size
-                    except Exception as e:
-                        print(f"Error cleaning {cache_file_name}: {e}")
+                try:
+                    size = cache_file.stat().st_size
+                    cache_file.unlink()
+                    bytes_freed += size
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    print(f"Error cleaning {cache_file_name}: {e}")
         
         return bytes_freed
     
@@ -118,23 +124,43 @@ class CacheCleaner:
             keep_history=False
         )
     
+    @staticmethod
+    def _existing_cache_dirs(search_locations: List[Path]) -> List[Path]:
+        """Cache directories present under any of the search locations"""
+        return [
+            search_dir / cache_dir_name
+            for search_dir in search_locations
+            for cache_dir_name in CacheCleaner.CACHE_DIRS
+            if (search_dir / cache_dir_name).exists()
+        ]
+    
+    @staticmethod
+    def _map_dirs(func: Callable[[Path], int], paths: List[Path], workers: int) -> List[int]:
+        """Apply func to every path, on a thread pool when there is more than one"""
+        if len(paths) < 2 or workers < 2:
+            return [func(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            return list(executor.map(func, paths))
+    
+    @staticmethod
+    def _remove_dir(path: Path) -> int:
+        """Remove a cache directory and return the bytes it held"""
+        try:
+            size = CacheCleaner._get_dir_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            return size
+        except Exception as e:
+            print(f"Error cleaning {path.name}: {e}")
+            return 0
+    
     @staticmethod
     def _get_dir_size(path: Path) -> int:
         """Calculate total size of directory"""
-        total = 0
-        try:
-            for f in path.rglob('*'):
-                if f.is_file():
-                    try:
-                        total += f.stat().st_size
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-        return total
+        return dir_size(path)
     
     @staticmethod
-    def get_cleanable_size(profile_dir: Path, keep_cookies: bool = True, keep_history: bool = True) -> int:
+    def get_cleanable_size(profile_dir: Path, keep_cookies: bool = True, keep_history: bool = True,
+                           workers: int = WORKERS) -> int:
         """
         Calculate how much space can be freed without actually cleaning
         
@@ -142,6 +168,7 @@ class CacheCleaner:
             profile_dir: Path to profile directory
             keep_cookies: If True, excludes cookies from calculation
             keep_history: If True, excludes history from calculation
+            workers: Threads used to size cache directories
             
         Returns:
             Number of bytes that can be freed
@@ -159,13 +186,14 @@ class CacheCleaner:
         if default_profile.exists():
             search_locations.append(default_profile)
         
+        # Calculate cache directories size
+        total_size += sum(CacheCleaner._map_dirs(
+            CacheCleaner._get_dir_size,
+            CacheCleaner._existing_cache_dirs(search_locations),
+            workers
+        ))
+        
         for search_dir in search_locations:
-            # Calculate cache directories size
-            for cache_dir_name in CacheCleaner.CACHE_DIRS:
-                cache_path = search_dir / cache_dir_name
-                if cache_path.exists():
-                    total_size += CacheCleaner._get_dir_size(cache_path)
-            
             # Calculate cache files size
             files_to_count = []
             for cache_file in CacheCleaner.CACHE_FILES:
@@ -177,10 +205,9 @@ class CacheCleaner:
             
             for cache_file_name in files_to_count:
                 cache_file = search_dir / cache_file_name
-                if cache_file.exists():
-                    try:
-                        total_size += cache_file.stat().st_size
-                    except Exception:
-                        pass
+                try:
+                    total_size += cache_file.stat().st_size
+                except Exception:
+                    pass
         
         return total_size
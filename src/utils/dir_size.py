@@ -0,0 +1,32 @@
+"""
+Directory size walker shared by the profile manager, cache cleaner and size report
+"""
+import os
+from pathlib import Path
+from typing import Union
+
+
+def dir_size(path: Union[str, Path]) -> int:
+    """Total size of regular files under path
+
+    Uses os.scandir so file types come from the directory listing and each
+    file costs at most one stat call. Entries that vanish or cannot be read
+    mid-walk (a running browser's cache, directories Chrome keeps locked)
+    are skipped.
+    """
+    total = 0
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
@@ -4,11 +4,17 @@ Generates realistic browser fingerprints to avoid detection
 """
 import random
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 @dataclass
 class BrowserFingerprint:
     """Browser fingerprint configuration"""
+    # Spelled out because dataclass(slots=True) needs Python 3.10
+    __slots__ = ('user_agent', 'platform', 'vendor', 'renderer', 'language', 'languages',
+                 'screen_width', 'screen_height', 'viewport_width', 'viewport_height',
+                 'hardware_concurrency', 'device_memory', 'color_depth', 'timezone',
+                 'webgl_vendor', 'webgl_renderer')
+
     user_agent: str
     platform: str
     vendor: str
@@ -27,7 +33,37 @@ class BrowserFingerprint:
     webgl_renderer: str
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Fields are flat, so asdict()'s recursive deepcopy is not needed
+        return {
+            'user_agent': self.user_agent,
+            'platform': self.platform,
+            'vendor': self.vendor,
+            'renderer': self.renderer,
+            'language': self.language,
+            'languages': list(self.languages),
+            'screen_width': self.screen_width,
+            'screen_height': self.screen_height,
+            'viewport_width': self.viewport_width,
+            'viewport_height': self.viewport_height,
+            'hardware_concurrency': self.hardware_concurrency,
+            'device_memory': self.device_memory,
+            'color_depth': self.color_depth,
+            'timezone': self.timezone,
+            'webgl_vendor': self.webgl_vendor,
+            'webgl_renderer': self.webgl_renderer
+        }
+
+def _build_user_agents(os_strings: Dict[str, str], chrome_versions: List[str]) -> Dict[str, List[str]]:
+    """User Agent strings for every OS/Chrome version pair"""
+    return {
+        os_type: [
+            f'Mozilla/5.0 ({os_string}) '
+            f'AppleWebKit/537.36 (KHTML, like Gecko) '
+            f'Chrome/{chrome_version} Safari/537.36'
+            for chrome_version in chrome_versions
+        ]
+        for os_type, os_string in os_strings.items()
+    }
 
 class FingerprintGenerator:
     """Generates realistic browser fingerprints"""
@@ -71,24 +107,50 @@ class FingerprintGenerator:
         'Asia/Shanghai', 'Europe/Kiev'
     ]
 
-    @staticmethod
-    def generate_user_agent(os_type: str = 'windows') -> str:
-        """Generate realistic User Agent string"""
-        chrome_version = random.choice(FingerprintGenerator.CHROME_VERSIONS)
-
-        os_strings = {
-            'windows': f'Windows NT 10.0; Win64; x64',
-            'macos': f'Macintosh; Intel Mac OS X 10_15_7',
-            'linux': f'X11; Linux x86_64'
+    OS_STRINGS = {
+        'windows': 'Windows NT 10.0; Win64; x64',
+        'macos': 'Macintosh; Intel Mac OS X 10_15_7',
+        'linux': 'X11; Linux x86_64'
+    }
+
+    # Every OS/version combination is formatted once here; generation only
+    # picks from these, so each profile still gets a random choice
+    USER_AGENTS = _build_user_agents(OS_STRINGS, CHROME_VERSIONS)
+
+    # Platform-specific settings
+    PLATFORMS = {
+        'windows': {
+            'platform': 'Win32',
+            'vendor': 'Google Inc.',
+            'renderer': 'Google Inc. (NVIDIA)',
+        },
+        'macos': {
+            'platform': 'MacIntel',
+            'vendor': 'Google Inc.',
+            'renderer': 'Google Inc. (Apple)',
+        },
+        'linux': {
+            'platform': 'Linux x86_64',
+            'vendor': 'Google Inc.',
+            'renderer': 'Google Inc. (NVIDIA)',
         }
+    }
 
-        os_string = os_strings.get(os_type, os_strings['windows'])
+    HARDWARE_CONCURRENCY = [4, 8, 12, 16]
+    DEVICE_MEMORY = [4, 8, 16, 32]
 
-        return (
-            f'Mozilla/5.0 ({os_string}) '
-            f'AppleWebKit/537.36 (KHTML, like Gecko) '
-            f'Chrome/{chrome_version} Safari/537.36'
-        )
+    LANGUAGE_OPTIONS = [
+        (('en-US', 'en'), 'en-US'),
+        (('ru-RU', 'ru', 'en-US', 'en'), 'ru-RU'),
+        (('de-DE', 'de', 'en-US', 'en'), 'de-DE'),
+        (('fr-FR', 'fr', 'en-US', 'en'), 'fr-FR'),
+    ]
+
+    @staticmethod
+    def generate_user_agent(os_type: str = 'windows') -> str:
+        """Generate realistic User Agent string"""
+        user_agents = FingerprintGenerator.USER_AGENTS
+        return random.choice(user_agents.get(os_type) or user_agents['windows'])
 
     @staticmethod
     def generate(os_type: str = 'windows', custom_user_agent: Optional[str] = None) -> BrowserFingerprint:
@@ -103,38 +165,15 @@ class FingerprintGenerator:
         webgl_config = random.choice(FingerprintGenerator.WEBGL_CONFIGS)
 
         # Platform-specific settings
-        platforms = {
-            'windows': {
-                'platform': 'Win32',
-                'vendor': 'Google Inc.',
-                'renderer': 'Google Inc. (NVIDIA)',
-            },
-            'macos': {
-                'platform': 'MacIntel',
-                'vendor': 'Google Inc.',
-                'renderer': 'Google Inc. (Apple)',
-            },
-            'linux': {
-                'platform': 'Linux x86_64',
-                'vendor': 'Google Inc.',
-                'renderer': 'Google Inc. (NVIDIA)',
-            }
-        }
-
+        platforms = FingerprintGenerator.PLATFORMS
         platform_config = platforms.get(os_type, platforms['windows'])
 
         # Hardware specs
-        hardware_concurrency = random.choice([4, 8, 12, 16])
-        device_memory = random.choice([4, 8, 16, 32])
+        hardware_concurrency = random.choice(FingerprintGenerator.HARDWARE_CONCURRENCY)
+        device_memory = random.choice(FingerprintGenerator.DEVICE_MEMORY)
 
         # Language
-        languages_options = [
-            (['en-US', 'en'], 'en-US'),
-            (['ru-RU', 'ru', 'en-US', 'en'], 'ru-RU'),
-            (['de-DE', 'de', 'en-US', 'en'], 'de-DE'),
-            (['fr-FR', 'fr', 'en-US', 'en'], 'fr-FR'),
-        ]
-        languages, language = random.choice(languages_options)
+        languages, language = random.choice(FingerprintGenerator.LANGUAGE_OPTIONS)
 
         return BrowserFingerprint(
             user_agent=custom_user_agent or FingerprintGenerator.generate_user_agent(os_type),
@@ -142,7 +181,7 @@ class FingerprintGenerator:
             vendor=platform_config['vendor'],
             renderer=platform_config['renderer'],
             language=language,
-            languages=languages,
+            languages=list(languages),
             screen_width=screen_width,
             screen_height=screen_height,
             viewport_width=viewport_width,
@@ -0,0 +1,30 @@
+"""
+JSON encoding helpers - uses orjson when installed, stdlib json otherwise
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (2-space indent by default)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: Union[bytes, memoryview, str]) -> Any:
+    """Deserialize JSON from bytes, a memoryview or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+# Both backends raise a ValueError subclass on malformed input
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
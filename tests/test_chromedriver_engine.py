@@ -0,0 +1,86 @@
+"""
+Session saving in ChromeDriverEngine._watch_session
+"""
+import asyncio
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.core.engines import chromedriver_engine
+from src.core.engines.chromedriver_engine import ChromeDriverEngine, _SessionWriter
+
+URLS = ["https://example.com/", "https://example.org/", "https://example.net/"]
+
+
+def _created(target_id: str, url: str) -> dict:
+    return {"method": "Target.targetCreated",
+            "params": {"targetInfo": {"targetId": target_id, "type": "page", "url": url}}}
+
+
+def _destroyed(target_id: str) -> dict:
+    return {"method": "Target.targetDestroyed", "params": {"targetId": target_id}}
+
+
+class _FakeCDP:
+    """Replays scripted events; None is a timeout, ConnectionError a dropped socket"""
+
+    def __init__(self, events: list):
+        self._events = list(events)
+
+    async def send(self, method, params=None, timeout=10.0, session_id=None):
+        return {}
+
+    async def next_event(self, timeout):
+        if not self._events:
+            raise ConnectionError("closed")
+        event = self._events.pop(0)
+        if isinstance(event, Exception):
+            raise event
+        return event
+
+    async def close(self):
+        pass
+
+
+class WatchSessionTest(unittest.TestCase):
+    def _watch(self, events: list) -> list:
+        """Run _watch_session over events, close the session and return every saved URL list"""
+        saved = []
+        writer = _SessionWriter(lambda _dir, urls: saved.append(urls), Path("profile"), "test")
+        connect = mock.AsyncMock(return_value=_FakeCDP(events))
+        with mock.patch.object(chromedriver_engine.CDPSession, "connect", connect), \
+                mock.patch.object(chromedriver_engine, "SESSION_SAVE_DEBOUNCE", 0.0):
+            monitored = asyncio.run(ChromeDriverEngine()._watch_session("127.0.0.1:9222", "test", writer))
+        self.assertTrue(monitored)
+        # What _ChromeDriverSession.close() does before quitting the driver
+        writer.flush()
+        return saved
+
+    def test_closing_window_saves_every_tab(self):
+        events = [_created(f"t{i}", url) for i, url in enumerate(URLS)]
+        # Debounce expires and the three tabs are saved; then the window closes
+        events += [None] + [_destroyed(f"t{i}") for i in range(len(URLS))]
+        saved = self._watch(events)
+        self.assertEqual(saved[-1], URLS)
+
+    def test_closing_window_with_pending_change_saves_every_tab(self):
+        events = [_created(f"t{i}", url) for i, url in enumerate(URLS)]
+        events += [_destroyed(f"t{i}") for i in range(len(URLS))]
+        saved = self._watch(events)
+        self.assertEqual(saved, [URLS])
+
+    def test_disconnect_during_teardown_saves_every_tab(self):
+        events = [_created(f"t{i}", url) for i, url in enumerate(URLS)]
+        events += [None, _destroyed("t0"), ConnectionError("closed")]
+        saved = self._watch(events)
+        self.assertEqual(saved[-1], URLS)
+
+    def test_tab_closed_while_browser_stays_open_is_saved(self):
+        events = [_created(f"t{i}", url) for i, url in enumerate(URLS)]
+        events += [None, _destroyed("t0"), None]
+        saved = self._watch(events)
+        self.assertEqual(saved[-1], URLS[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()